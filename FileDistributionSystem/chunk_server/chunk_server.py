@@ -1,13 +1,16 @@
 """Server that stores actual file chunks."""
 
 import os
+import json
 import hashlib
+import mmap
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
-from common.constants import HEARTBEAT_INTERVAL
+from common.constants import HEARTBEAT_INTERVAL, SCRUB_INTERVAL
 from common.models import (
     ChunkInfo,
     UploadChunkRequest,
@@ -37,11 +40,78 @@ class ChunkCorruptedError(ChunkError):
     pass
 
 
+# Number of partitions in the local chunk index (must be a power of two)
+INDEX_SHARDS = 16
+
+# Scrubbing: chunks verified per batch and threads hashing each batch.
+# hashlib hashes without the GIL, so workers scale with available cores.
+SCRUB_BATCH_SIZE = 64
+SCRUB_WORKERS = min(8, os.cpu_count() or 1)
+
+# Scrub pacing: finish a pass within this fraction of SCRUB_INTERVAL, run
+# unthrottled below the idle load and back off above the busy load (per CPU)
+SCRUB_PACE_FRACTION = 0.5
+SCRUB_IDLE_LOAD = 0.25
+SCRUB_BUSY_LOAD = 1.0
+
+# Seconds stop() waits for each background thread to exit
+SHUTDOWN_TIMEOUT = 5.0
+
+# Checksum manifest kept in the data directory to avoid re-hashing on startup
+MANIFEST_FILE = "manifest.json"
+
+# Threads used to scan shard directories on startup; scandir and stat
+# release the GIL, so like scrubbing this scales with available cores
+SCAN_WORKERS = min(16, os.cpu_count() or 1)
+
+# Seconds a part upload may sit incomplete before its parts are discarded
+PART_UPLOAD_TIMEOUT = 10 * 60
+
+
 def sha256(data: bytes) -> str:
     """Compute SHA-256 hash of data."""
     return hashlib.sha256(data).hexdigest()
 
 
+def sha256_file(f) -> str:
+    """Compute SHA-256 hash of an open binary file without loading it whole."""
+    # Hash straight from the page cache when the file can be mapped
+    if os.fstat(f.fileno()).st_size:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                return hashlib.sha256(mm).hexdigest()
+        except (OSError, ValueError):
+            pass
+
+    # Empty or unmappable files: file_digest streams through its own buffer
+    return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+class _IndexShard:
+    """One partition of the local chunk index, guarded by its own lock."""
+
+    __slots__ = ('lock', 'chunks', 'used')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.chunks: Dict[str, ChunkInfo] = {}
+        self.used = 0  # Bytes stored by chunks in this partition
+
+
+class _PartUpload:
+    """Parts received so far for one attempt at uploading a chunk in pieces."""
+
+    __slots__ = ('temp_path', 'total_size', 'parts', 'started')
+
+    def __init__(self, temp_path: str, total_size: int):
+        self.temp_path = temp_path
+        self.total_size = total_size
+        self.parts: Dict[int, int] = {}  # offset -> size
+        self.started = time.monotonic()
+
+
 class ChunkServer:
     """Server that stores actual file chunks."""
 
@@ -50,20 +120,25 @@ class ChunkServer:
         self.server_id = server_id
         self.address = address
         self.data_dir = data_dir
+        self._path_prefix = os.path.join(data_dir, '')  # Precomputed for _chunk_path
         self.capacity = capacity
         self.metadata_addresses = metadata_addresses or []
 
-        # Local chunk index
-        self.chunks: Dict[str, ChunkInfo] = {}
+        # Local chunk index, partitioned by chunk ID hash
+        self._shards = [_IndexShard() for _ in range(INDEX_SHARDS)]
+
+        # Shard directories known to exist (avoids a mkdir per write)
+        self._shard_dirs: Set[str] = set()
 
-        # Stats
-        self.used = 0
+        # Chunks being uploaded in pieces, keyed by (chunk ID, upload attempt)
+        self._partial_uploads: Dict[Tuple[str, str], _PartUpload] = {}
+        self._partial_lock = threading.Lock()
 
-        # Locks
-        self._lock = threading.RLock()
+        # Replica servers sharing this host's filesystem, keyed by server ID
+        self._local_peers: Dict[str, 'ChunkServer'] = {}
 
-        # Running state
-        self._running = False
+        # Running state; set to wake background threads for shutdown
+        self._stop = threading.Event()
         self._threads: List[threading.Thread] = []
 
         # Ensure data directory exists
@@ -71,7 +146,7 @@ class ChunkServer:
 
     def start(self):
         """Start the chunk server."""
-        self._running = True
+        self._stop.clear()
 
         # Scan existing chunks
         self._scan_local_chunks()
@@ -87,17 +162,28 @@ class ChunkServer:
 
     def stop(self):
         """Stop the chunk server."""
-        self._running = False
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=SHUTDOWN_TIMEOUT)
+        self._save_manifest()
+
+    def set_local_peer(self, server_id: str, server: 'ChunkServer'):
+        """Register a replica server whose data directory is on this host."""
+        self._local_peers[server_id] = server
 
     # ─────────────────────────────────────────────────────────────
     # CHUNK STORAGE
     # ─────────────────────────────────────────────────────────────
 
+    def _shard_for(self, chunk_id: str) -> _IndexShard:
+        """Get the index partition owning a chunk."""
+        # str caches its hash, so repeat lookups for an ID cost no hashing
+        return self._shards[hash(chunk_id) & (INDEX_SHARDS - 1)]
+
     def _chunk_path(self, chunk_id: str) -> str:
         """Get file path for a chunk (sharded by prefix)."""
         # Use first 4 chars for directory sharding
-        prefix = chunk_id[:4]
-        return os.path.join(self.data_dir, prefix, chunk_id)
+        return f"{self._path_prefix}{chunk_id[:4]}{os.sep}{chunk_id}"
 
     def write_chunk(self, chunk_id: str, data: bytes, checksum: str) -> bool:
         """Write a chunk to local storage."""
@@ -111,13 +197,22 @@ class ChunkServer:
 
         # Write to disk
         path = self._chunk_path(chunk_id)
-        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._ensure_shard_dir(path)
 
         # Write to temp file first, then rename (atomic)
         temp_path = f"{path}.tmp"
         try:
-            with open(temp_path, 'wb') as f:
-                f.write(data)
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                # Reserve the full extent up front in a single allocation
+                if data and hasattr(os, 'posix_fallocate'):
+                    try:
+                        os.posix_fallocate(fd, 0, len(data))
+                    except OSError:
+                        pass  # Not supported by this filesystem
+                self._write_all(fd, data)
+            finally:
+                os.close(fd)
             os.rename(temp_path, path)
         except Exception:
             # Clean up temp file on failure
@@ -125,38 +220,205 @@ class ChunkServer:
                 os.remove(temp_path)
             raise
 
-        # Update local index
-        with self._lock:
-            self.chunks[chunk_id] = ChunkInfo(
+        self._index_chunk(chunk_id, len(data), checksum)
+        return True
+
+    def write_chunk_part(self, chunk_id: str, attempt: str, offset: int,
+                         data: bytes, total_size: int, checksum: str) -> bool:
+        """Write one part of a chunk uploaded in pieces.
+
+        Parts may arrive in any order and concurrently. Each upload attempt
+        assembles into its own temp file, so parts left over from an earlier
+        attempt are never counted or mixed in. Returns True once the last
+        part lands and the assembled chunk has been verified and stored,
+        False while parts are still outstanding.
+        """
+        if offset < 0 or offset + len(data) > total_size:
+            raise ChunkError(
+                f"Part at {offset} of {len(data)} bytes is outside "
+                f"chunk {chunk_id} of {total_size} bytes"
+            )
+
+        key = (chunk_id, attempt)
+        with self._partial_lock:
+            upload = self._partial_uploads.get(key)
+            if upload is None:
+                # A late part of a finished upload must not start a new one
+                if self.has_chunk(chunk_id):
+                    raise ChunkError(f"Chunk {chunk_id} is already stored")
+                path = self._chunk_path(chunk_id)
+                self._ensure_shard_dir(path)
+                upload = _PartUpload(f"{path}.{attempt}.parts.tmp", total_size)
+                # Created (and truncated) once per attempt; parts only open it
+                os.close(os.open(
+                    upload.temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644
+                ))
+                self._partial_uploads[key] = upload
+            elif upload.total_size != total_size:
+                raise ChunkError(
+                    f"Part of chunk {chunk_id} says {total_size} bytes, "
+                    f"upload started with {upload.total_size}"
+                )
+        temp_path = upload.temp_path
+
+        # Each part writes at its own offset into the attempt's temp file.
+        # No O_CREAT: a part arriving after the attempt finished or was
+        # discarded fails here instead of leaving a new file behind.
+        try:
+            fd = os.open(temp_path, os.O_WRONLY)
+            try:
+                view = memoryview(data)
+                position = offset
+                while view:
+                    written = os.pwrite(fd, view, position)
+                    view = view[written:]
+                    position += written
+            finally:
+                os.close(fd)
+        except OSError:
+            self._discard_part_upload(key)
+            raise
+
+        with self._partial_lock:
+            if self._partial_uploads.get(key) is not upload:
+                raise ChunkError(f"Upload {attempt} of chunk {chunk_id} was discarded")
+            upload.parts[offset] = len(data)
+            if sum(upload.parts.values()) < total_size:
+                return False
+            del self._partial_uploads[key]
+
+        # All parts received: verify the assembled chunk, then commit it
+        path = self._chunk_path(chunk_id)
+        try:
+            with open(temp_path, 'rb') as f:
+                computed_checksum = sha256_file(f)
+            if computed_checksum != checksum:
+                raise ChecksumMismatchError(
+                    f"Checksum mismatch for chunk {chunk_id}: "
+                    f"expected {checksum}, got {computed_checksum}"
+                )
+            os.rename(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self._index_chunk(chunk_id, total_size, checksum)
+        return True
+
+    def _discard_part_upload(self, key: Tuple[str, str]):
+        """Forget an upload attempt and remove its temp file."""
+        with self._partial_lock:
+            upload = self._partial_uploads.pop(key, None)
+        if upload is not None:
+            try:
+                os.remove(upload.temp_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Failed to remove {upload.temp_path}: {e}")
+
+    def _expire_part_uploads(self):
+        """Discard upload attempts whose parts stopped arriving."""
+        cutoff = time.monotonic() - PART_UPLOAD_TIMEOUT
+        with self._partial_lock:
+            expired = [key for key, upload in self._partial_uploads.items()
+                       if upload.started < cutoff]
+        for key in expired:
+            print(f"Discarding incomplete upload {key[1]} of chunk {key[0]}")
+            self._discard_part_upload(key)
+
+    def _ensure_shard_dir(self, path: str):
+        """Create the shard directory for a chunk path if not yet known."""
+        shard_dir = os.path.dirname(path)
+        if shard_dir not in self._shard_dirs:
+            os.makedirs(shard_dir, exist_ok=True)
+            self._shard_dirs.add(shard_dir)
+
+    def _index_chunk(self, chunk_id: str, size: int, checksum: str):
+        """Add a chunk stored on disk to the local index."""
+        shard = self._shard_for(chunk_id)
+        with shard.lock:
+            shard.chunks[chunk_id] = ChunkInfo(
                 chunk_id=chunk_id,
-                size=len(data),
+                size=size,
                 checksum=checksum,
                 created_at=datetime.now(),
             )
-            self.used += len(data)
+            shard.used += size
+
+    def copy_chunk_from(self, chunk_id: str, src_path: str,
+                        size: int, checksum: str) -> bool:
+        """Store a chunk by copying a verified file on the same host.
 
+        Uses copy_file_range so the bytes stay in the kernel (reflinked on
+        filesystems that support it). The source was checksummed when it
+        was written, so it is not hashed again here.
+        """
+        path = self._chunk_path(chunk_id)
+        self._ensure_shard_dir(path)
+
+        temp_path = f"{path}.tmp"
+        try:
+            with open(src_path, 'rb') as src:
+                fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    remaining = size
+                    while remaining:
+                        copied = os.copy_file_range(src.fileno(), fd, remaining)
+                        if copied == 0:
+                            raise ChunkError(
+                                f"Short copy of chunk {chunk_id} from {src_path}"
+                            )
+                        remaining -= copied
+                finally:
+                    os.close(fd)
+            os.rename(temp_path, path)
+        except Exception:
+            # Clean up temp file on failure
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self._index_chunk(chunk_id, size, checksum)
         return True
 
-    def read_chunk(self, chunk_id: str) -> bytes:
-        """Read a chunk from local storage."""
+    @staticmethod
+    def _write_all(fd: int, data: bytes):
+        """Write data to a raw file descriptor without an extra buffer copy."""
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+
+    def read_chunk(self, chunk_id: str, verify: bool = False) -> bytes:
+        """Read a chunk from local storage.
+
+        Integrity is normally left to the background scrubber and to the
+        client, which checks the chunk checksum on download. Pass
+        verify=True to re-hash the data on this read as well.
+        """
         path = self._chunk_path(chunk_id)
 
-        if not os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
             raise ChunkNotFoundError(f"Chunk not found: {chunk_id}")
 
-        with open(path, 'rb') as f:
-            data = f.read()
+        if not verify:
+            return data
 
         # Verify checksum
-        with self._lock:
-            if chunk_id in self.chunks:
-                expected = self.chunks[chunk_id].checksum
-                actual = sha256(data)
-                if actual != expected:
-                    raise ChunkCorruptedError(
-                        f"Chunk corrupted: {chunk_id}, "
-                        f"expected {expected}, got {actual}"
-                    )
+        info = self.get_chunk_info(chunk_id)
+        if info is not None:
+            expected = info.checksum
+            actual = sha256(data)
+            if actual != expected:
+                raise ChunkCorruptedError(
+                    f"Chunk corrupted: {chunk_id}, "
+                    f"expected {expected}, got {actual}"
+                )
 
         return data
 
@@ -164,31 +426,67 @@ class ChunkServer:
         """Delete a chunk from local storage."""
         path = self._chunk_path(chunk_id)
 
-        with self._lock:
-            if os.path.exists(path):
+        shard = self._shard_for(chunk_id)
+        with shard.lock:
+            try:
                 size = os.path.getsize(path)
                 os.remove(path)
-                self.used -= size
+                shard.used -= size
+            except FileNotFoundError:
+                pass
 
-            if chunk_id in self.chunks:
-                del self.chunks[chunk_id]
+            shard.chunks.pop(chunk_id, None)
 
         return True
 
+    def delete_chunks(self, chunk_ids: List[str]) -> List[str]:
+        """Delete a batch of chunks. Returns the IDs that could not be deleted."""
+        failed = []
+        for chunk_id in chunk_ids:
+            try:
+                self.delete_chunk(chunk_id)
+            except OSError as e:
+                print(f"Failed to delete chunk {chunk_id}: {e}")
+                failed.append(chunk_id)
+        return failed
+
     def has_chunk(self, chunk_id: str) -> bool:
         """Check if chunk exists locally."""
-        with self._lock:
-            return chunk_id in self.chunks
+        shard = self._shard_for(chunk_id)
+        with shard.lock:
+            return chunk_id in shard.chunks
 
     def list_chunks(self) -> List[str]:
         """List all chunk IDs."""
-        with self._lock:
-            return list(self.chunks.keys())
+        chunk_ids = []
+        for shard in self._shards:
+            with shard.lock:
+                chunk_ids.extend(shard.chunks.keys())
+        return chunk_ids
 
     def get_chunk_info(self, chunk_id: str) -> Optional[ChunkInfo]:
         """Get chunk info."""
-        with self._lock:
-            return self.chunks.get(chunk_id)
+        shard = self._shard_for(chunk_id)
+        with shard.lock:
+            return shard.chunks.get(chunk_id)
+
+    def _snapshot_checksums(self) -> List[Tuple[str, str]]:
+        """Snapshot (chunk_id, checksum) pairs for bulk scans."""
+        pairs = []
+        for shard in self._shards:
+            with shard.lock:
+                pairs.extend((info.chunk_id, info.checksum)
+                             for info in shard.chunks.values())
+        return pairs
+
+    @property
+    def used(self) -> int:
+        """Bytes used by stored chunks, summed over index partitions."""
+        return sum(shard.used for shard in self._shards)
+
+    def _chunk_count(self) -> int:
+        """Count chunks across all index partitions."""
+        return sum(len(shard.chunks) for shard in self._shards)
 
     # ─────────────────────────────────────────────────────────────
     # REQUEST HANDLERS
@@ -197,6 +495,23 @@ class ChunkServer:
     def handle_upload(self, request: UploadChunkRequest) -> UploadChunkResponse:
         """Handle chunk upload from client."""
         try:
+            if request.total_size is not None:
+                # One part of a chunk; replicate once it is complete
+                if not self.write_chunk_part(
+                    request.chunk_id, request.upload_attempt, request.offset,
+                    request.data, request.total_size, request.checksum,
+                ):
+                    return UploadChunkResponse(success=True)
+                if request.replica_servers:
+                    # The assembled chunk is only on disk: replicate from there
+                    self._replicate_to_chain(
+                        request.chunk_id,
+                        request.total_size,
+                        request.checksum,
+                        request.replica_servers,
+                    )
+                return UploadChunkResponse(success=True)
+
             # Write locally first
             self.write_chunk(request.chunk_id, request.data, request.checksum)
 
@@ -204,9 +519,10 @@ class ChunkServer:
             if request.replica_servers:
                 self._replicate_to_chain(
                     request.chunk_id,
-                    request.data,
+                    len(request.data),
                     request.checksum,
                     request.replica_servers,
+                    request.data,
                 )
 
             return UploadChunkResponse(success=True)
@@ -214,26 +530,52 @@ class ChunkServer:
         except Exception as e:
             return UploadChunkResponse(success=False, error=str(e))
 
+    def handle_abort_upload(self, chunk_id: str, upload_attempt: str) -> bool:
+        """Discard the parts received so far for a failed upload attempt."""
+        self._discard_part_upload((chunk_id, upload_attempt))
+        return True
+
     def handle_download(self, request: DownloadChunkRequest) -> DownloadChunkResponse:
         """Handle chunk download request."""
         data = self.read_chunk(request.chunk_id)
 
-        with self._lock:
-            checksum = self.chunks[request.chunk_id].checksum
+        shard = self._shard_for(request.chunk_id)
+        with shard.lock:
+            checksum = shard.chunks[request.chunk_id].checksum
 
         return DownloadChunkResponse(data=data, checksum=checksum)
 
-    def _replicate_to_chain(self, chunk_id: str, data: bytes,
-                            checksum: str, replica_servers: List[str]):
-        """Replicate chunk to chain of servers."""
+    def _replicate_to_chain(self, chunk_id: str, size: int, checksum: str,
+                            replica_servers: List[str],
+                            data: Optional[bytes] = None):
+        """Replicate chunk to chain of servers.
+
+        Without data, the chunk is sent from its stored file.
+        """
         if not replica_servers:
             return
 
         next_server = replica_servers[0]
         remaining = replica_servers[1:]
 
+        peer = self._local_peers.get(next_server)
+        if peer is not None and hasattr(os, 'copy_file_range'):
+            try:
+                # Same host: copy in the kernel rather than shipping bytes
+                peer.copy_chunk_from(
+                    chunk_id, self._chunk_path(chunk_id), size, checksum
+                )
+            except (OSError, ChunkError) as e:
+                # e.g. cross-device on older kernels, or a short copy;
+                # fall back to the RPC
+                print(f"Local copy to {next_server} failed: {e}")
+            else:
+                peer._replicate_to_chain(chunk_id, size, checksum, remaining, data)
+                return
+
         try:
-            # In production, this would be an RPC call
+            # In production, this would be an RPC call, streaming the stored
+            # file (e.g. with sendfile) when no data was passed in
             # client = ChunkServerClient(next_server)
             # client.upload_chunk(
             #     chunk_id=chunk_id,
@@ -253,13 +595,15 @@ class ChunkServer:
 
     def _heartbeat_loop(self):
         """Background thread to send heartbeats to metadata service."""
-        while self._running:
+        while not self._stop.is_set():
             try:
                 self._send_heartbeat()
             except Exception as e:
                 print(f"Heartbeat failed: {e}")
 
-            time.sleep(HEARTBEAT_INTERVAL)
+            self._expire_part_uploads()
+
+            self._stop.wait(HEARTBEAT_INTERVAL)
 
     def _send_heartbeat(self):
         """Send heartbeat to metadata service."""
@@ -272,7 +616,7 @@ class ChunkServer:
         #             address=self.address,
         #             capacity=self.capacity,
         #             used=self.used,
-        #             chunk_count=len(self.chunks),
+        #             chunk_count=self._chunk_count(),
         #         )
         #         break
         #     except Exception:
@@ -285,50 +629,101 @@ class ChunkServer:
 
     def _scrub_loop(self):
         """Background thread to verify chunk integrity."""
-        while self._running:
+        while not self._stop.is_set():
+            started = time.monotonic()
             try:
                 self._scrub_chunks()
             except Exception as e:
                 print(f"Scrubbing failed: {e}")
 
-            # Full scan every 24 hours
-            time.sleep(60 * 60 * 24)
+            # Full scan every SCRUB_INTERVAL, counting the pass itself
+            self._stop.wait(max(0.0, SCRUB_INTERVAL - (time.monotonic() - started)))
 
     def _scrub_chunks(self):
         """Verify integrity of all chunks."""
-        with self._lock:
-            chunk_ids = list(self.chunks.keys())
-
-        for chunk_id in chunk_ids:
-            if not self._running:
-                break
-
-            try:
-                info = self.chunks.get(chunk_id)
-                if info is None:
-                    continue
+        entries = self._snapshot_checksums()
+        if not entries:
+            return
 
-                path = self._chunk_path(chunk_id)
+        # Pace the pass by bytes so it completes well within SCRUB_INTERVAL
+        started = time.monotonic()
+        target_rate = self.used / (SCRUB_INTERVAL * SCRUB_PACE_FRACTION)
+        avg_size = self.used / len(entries)
+        bytes_done = 0.0
+
+        # Hash a batch of chunks concurrently (hashlib releases the GIL),
+        # so disk reads of one chunk overlap with hashing of another
+        with ThreadPoolExecutor(max_workers=SCRUB_WORKERS) as executor:
+            for start in range(0, len(entries), SCRUB_BATCH_SIZE):
+                if self._stop.is_set():
+                    break
+
+                # One lane of chunks per worker, rather than one task per chunk
+                batch = entries[start:start + SCRUB_BATCH_SIZE]
+                lanes = [batch[i::SCRUB_WORKERS] for i in range(SCRUB_WORKERS)]
+                for results in executor.map(self._verify_chunks, lanes):
+                    for chunk_id, issue in results:
+                        if issue == "MISSING":
+                            print(f"Missing chunk: {chunk_id}")
+                            self._report_missing_chunk(chunk_id)
+                        elif issue == "CORRUPTED":
+                            print(f"Corrupted chunk detected: {chunk_id}")
+                            self._report_corrupted_chunk(chunk_id)
+
+                # Throttle scrubbing
+                bytes_done += avg_size * len(batch)
+                if start + SCRUB_BATCH_SIZE < len(entries):
+                    self._stop.wait(self._scrub_delay(
+                        bytes_done, time.monotonic() - started, target_rate))
+
+    def _scrub_delay(self, bytes_done: float, elapsed: float,
+                     target_rate: float) -> float:
+        """Seconds to pause so scrubbing tracks its target rate and system load."""
+        if target_rate <= 0:
+            return 0.0
+
+        delay = bytes_done / target_rate - elapsed
+        if delay <= 0:
+            return 0.0
 
-                if not os.path.exists(path):
-                    print(f"Missing chunk: {chunk_id}")
-                    self._report_missing_chunk(chunk_id)
-                    continue
+        try:
+            load = os.getloadavg()[0] / (os.cpu_count() or 1)
+        except (AttributeError, OSError):
+            return delay
+
+        if load < SCRUB_IDLE_LOAD:
+            return 0.0
+        if load > SCRUB_BUSY_LOAD:
+            return delay * 2
+        return delay
+
+    def _verify_chunks(self, entries: List[Tuple[str, str]]) -> List[Tuple[str, Optional[str]]]:
+        """Verify a lane of (chunk_id, checksum) entries sequentially."""
+        return [(chunk_id, self._verify_chunk(chunk_id, checksum))
+                for chunk_id, checksum in entries]
+
+    def _verify_chunk(self, chunk_id: str, expected: str) -> Optional[str]:
+        """Verify one chunk on disk; returns "MISSING", "CORRUPTED" or None."""
+        try:
+            path = self._chunk_path(chunk_id)
 
+            # Open directly; a separate exists() check costs an extra stat
+            try:
                 with open(path, 'rb') as f:
-                    data = f.read()
+                    actual_checksum = sha256_file(f)
+            except FileNotFoundError:
+                # Deleted since the snapshot was taken
+                if not self.has_chunk(chunk_id):
+                    return None
+                return "MISSING"
 
-                actual_checksum = sha256(data)
+            if actual_checksum != expected:
+                return "CORRUPTED"
 
-                if actual_checksum != info.checksum:
-                    print(f"Corrupted chunk detected: {chunk_id}")
-                    self._report_corrupted_chunk(chunk_id)
-
-            except Exception as e:
-                print(f"Error scrubbing chunk {chunk_id}: {e}")
+        except Exception as e:
+            print(f"Error scrubbing chunk {chunk_id}: {e}")
 
-            # Throttle scrubbing
-            time.sleep(0.1)
+        return None
 
     def _report_corrupted_chunk(self, chunk_id: str):
         """Report corrupted chunk to metadata service."""
@@ -352,8 +747,9 @@ class ChunkServer:
         # )
 
         # Remove from local index
-        with self._lock:
-            self.chunks.pop(chunk_id, None)
+        shard = self._shard_for(chunk_id)
+        with shard.lock:
+            shard.chunks.pop(chunk_id, None)
 
     # ─────────────────────────────────────────────────────────────
     # STARTUP & RECOVERY
@@ -361,43 +757,110 @@ class ChunkServer:
 
     def _scan_local_chunks(self):
         """Scan local storage on startup."""
-        self.chunks = {}
-        self.used = 0
+        self._shards = [_IndexShard() for _ in range(INDEX_SHARDS)]
 
         if not os.path.exists(self.data_dir):
             return
 
-        for root, dirs, files in os.walk(self.data_dir):
-            for filename in files:
-                if filename.endswith('.tmp'):
+        manifest, manifest_mtime = self._load_manifest()
+        rehashed = 0
+
+        shard_dirs = []
+        with os.scandir(self.data_dir) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    shard_dirs.append(entry.path)
+                elif entry.name.endswith('.tmp'):
+                    os.remove(entry.path)
+
+        # Shard directories are independent, so scan them in parallel
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+            results = executor.map(
+                lambda d: self._scan_shard_dir(d, manifest, manifest_mtime),
+                shard_dirs,
+            )
+            for infos, dir_rehashed in results:
+                rehashed += dir_rehashed
+                for info in infos:
+                    shard = self._shard_for(info.chunk_id)
+                    shard.chunks[info.chunk_id] = info
+                    shard.used += info.size
+
+        self._shard_dirs.update(shard_dirs)
+
+        print(f"Scanned {self._chunk_count()} chunks, {self.used} bytes used "
+              f"({rehashed} re-hashed)")
+
+        if rehashed:
+            self._save_manifest()
+
+    def _scan_shard_dir(self, shard_dir: str, manifest: Dict[str, list],
+                        manifest_mtime: int) -> Tuple[List[ChunkInfo], int]:
+        """Index the chunk files in one shard directory."""
+        infos = []
+        rehashed = 0
+
+        with os.scandir(shard_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.tmp'):
                     # Remove incomplete uploads
-                    path = os.path.join(root, filename)
-                    os.remove(path)
+                    os.remove(entry.path)
                     continue
 
-                chunk_id = filename
-                path = os.path.join(root, filename)
+                chunk_id = entry.name
 
                 try:
-                    size = os.path.getsize(path)
-
-                    # Compute checksum
-                    with open(path, 'rb') as f:
-                        checksum = sha256(f.read())
-
-                    self.chunks[chunk_id] = ChunkInfo(
+                    st = entry.stat(follow_symlinks=False)
+                    size = st.st_size
+
+                    # Trust the manifest for files untouched since it was
+                    # written; scrubbing covers bit rot over time
+                    cached = manifest.get(chunk_id)
+                    if cached and cached[0] == size and st.st_mtime_ns <= manifest_mtime:
+                        checksum = cached[1]
+                    else:
+                        with open(entry.path, 'rb') as f:
+                            checksum = sha256_file(f)
+                        rehashed += 1
+
+                    infos.append(ChunkInfo(
                         chunk_id=chunk_id,
                         size=size,
                         checksum=checksum,
-                        created_at=datetime.fromtimestamp(os.path.getctime(path)),
-                    )
-
-                    self.used += size
+                        created_at=datetime.fromtimestamp(st.st_ctime),
+                    ))
 
                 except Exception as e:
                     print(f"Error scanning chunk {chunk_id}: {e}")
 
-        print(f"Scanned {len(self.chunks)} chunks, {self.used} bytes used")
+        return infos, rehashed
+
+    def _load_manifest(self) -> Tuple[Dict[str, list], int]:
+        """Load the checksum manifest and its modification time (ns)."""
+        path = os.path.join(self.data_dir, MANIFEST_FILE)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            with open(path, 'r') as f:
+                return json.load(f), mtime
+        except Exception:
+            return {}, 0
+
+    def _save_manifest(self):
+        """Persist chunk sizes and checksums so restarts can skip re-hashing."""
+        manifest = {}
+        for shard in self._shards:
+            with shard.lock:
+                for info in shard.chunks.values():
+                    manifest[info.chunk_id] = [info.size, info.checksum]
+
+        path = os.path.join(self.data_dir, MANIFEST_FILE)
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(manifest, f)
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Failed to save chunk manifest: {e}")
 
     # ─────────────────────────────────────────────────────────────
     # STATS
@@ -405,12 +868,13 @@ class ChunkServer:
 
     def get_stats(self) -> dict:
         """Get server statistics."""
-        with self._lock:
-            return {
-                "server_id": self.server_id,
-                "address": self.address,
-                "capacity": self.capacity,
-                "used": self.used,
-                "available": self.capacity - self.used,
-                "chunk_count": len(self.chunks),
-            }
+        used = self.used
+
+        return {
+            "server_id": self.server_id,
+            "address": self.address,
+            "capacity": self.capacity,
+            "used": used,
+            "available": self.capacity - used,
+            "chunk_count": self._chunk_count(),
+        }
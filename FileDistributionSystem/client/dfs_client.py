@@ -2,11 +2,26 @@
 
 import os
 import json
+import base64
+import mmap
 import hashlib
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import hmac
+import itertools
+import threading
+import time
+from collections import deque
+from operator import attrgetter
+from contextlib import contextmanager
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    FIRST_EXCEPTION,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from typing import List, Callable, Optional, Dict, Any
 
-from common.constants import CHUNK_SIZE
+from common.constants import CHUNK_SIZE, SUB_CHUNK_SIZE
 from common.models import (
     FileInfo,
     UploadState,
@@ -16,14 +31,80 @@ from common.models import (
     Inode,
     UploadChunkRequest,
     DownloadChunkRequest,
+    generate_uuid,
+)
+
+# Resumable uploads persist their state after this many completed chunks
+UPLOAD_STATE_SAVE_INTERVAL = 4
+
+# Hedged downloads: a chunk request to another replica is started when the
+# current one has run longer than the p95 of recent chunk download times
+HEDGE_DELAY_DEFAULT = 0.5  # seconds, until enough samples are collected
+HEDGE_MIN_SAMPLES = 16
+HEDGE_SAMPLES = 64
+HEDGE_WORKERS = 16
+
+# Threads sending the parts of chunks uploaded in pieces, shared by all
+# chunk uploads of a client
+PART_UPLOAD_WORKERS = 16
+
+# Inode attributes in FileInfo field order, for positional construction
+_file_info_fields = attrgetter(
+    'name', 'type', 'size', 'created_at', 'modified_at', 'owner', 'version'
 )
 
 
 def sha256(data: bytes) -> str:
-    """Compute SHA-256 hash of data."""
+    """Compute SHA-256 hash of data as hex, the checksum wire format."""
     return hashlib.sha256(data).hexdigest()
 
 
+def sha256_bytes(data: bytes) -> bytes:
+    """Compute the raw 32-byte SHA-256 digest of data."""
+    return hashlib.sha256(data).digest()
+
+
+def hex_checksums(digests: bytearray) -> List[str]:
+    """Split packed 32-byte SHA-256 digests into hex checksums."""
+    view = memoryview(digests)
+    return [view[i:i + 32].hex() for i in range(0, len(view), 32)]
+
+
+def checksum_matches(data: bytes, checksum: str) -> bool:
+    """Check data against a hex SHA-256 checksum.
+
+    Compares raw digests so verifying a download never hex-encodes the
+    hash it just computed.
+    """
+    try:
+        expected = bytes.fromhex(checksum)
+    except (TypeError, ValueError):
+        return False
+    return hmac.compare_digest(sha256_bytes(data), expected)
+
+
+@contextmanager
+def map_file(path: str):
+    """Map a local file read-only and yield a memoryview over it.
+
+    Chunk slices of the view are served from the page cache without a
+    per-chunk open or read. Slices must be released before the block exits.
+    """
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            yield memoryview(b'')
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            view = memoryview(mm)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
 class DFSError(Exception):
     """Base exception for DFS client errors."""
     pass
@@ -49,6 +130,38 @@ class ChecksumMismatchError(DFSError):
     pass
 
 
+class _ProgressReporter:
+    """Reports transfer progress at most once per whole percent.
+
+    Safe to call from worker threads: chunks are counted with an
+    itertools.count, and the lock is only taken when the percentage
+    actually advances.
+    """
+
+    __slots__ = ('_callback', '_total', '_completed', '_last', '_lock')
+
+    def __init__(self, callback: Optional[Callable[[float], None]],
+                 total: int, done: int = 0):
+        self._callback = callback
+        self._total = total
+        self._completed = itertools.count(done + 1)
+        self._last = -1  # Last whole percent reported
+        self._lock = threading.Lock()
+
+    def advance(self):
+        """Record one completed chunk."""
+        if self._callback is None:
+            return
+
+        done = next(self._completed)
+        percent = done * 100 // self._total
+        if percent > self._last:
+            with self._lock:
+                if percent > self._last:
+                    self._last = percent
+                    self._callback(done * 100 / self._total)
+
+
 class MetadataClient:
     """Client for communicating with metadata service.
 
@@ -136,8 +249,12 @@ class ChunkServerClient:
     This is a stub implementation. In production, this would use gRPC or HTTP.
     """
 
-    def __init__(self, address: str):
+    def __init__(self, address: str, sub_chunk_size: int = SUB_CHUNK_SIZE,
+                 part_pool: Optional[Callable[[], ThreadPoolExecutor]] = None):
         self.address = address
+        self.sub_chunk_size = sub_chunk_size
+        # Returns the pool that sends parts; without one, parts go in turn
+        self._part_pool = part_pool
         self._chunk_server = None
 
     def set_chunk_server(self, server):
@@ -146,20 +263,68 @@ class ChunkServerClient:
 
     def upload_chunk(self, chunk_id: str, data: bytes,
                      checksum: str, replica_servers: List[str]):
-        """Upload a chunk."""
+        """Upload a chunk.
+
+        Chunks larger than sub_chunk_size are sent as parts on parallel
+        streams; the server reassembles them and verifies the whole chunk.
+        If a part fails, the parts the server already holds are discarded.
+        """
         if self._chunk_server:
-            request = UploadChunkRequest(
-                chunk_id=chunk_id,
-                data=data,
-                checksum=checksum,
-                replica_servers=replica_servers,
-            )
-            response = self._chunk_server.handle_upload(request)
-            if not response.success:
-                raise UploadError(response.error)
+            size = len(data)
+            if size <= self.sub_chunk_size:
+                self._send_upload(UploadChunkRequest(
+                    chunk_id=chunk_id,
+                    data=data,
+                    checksum=checksum,
+                    replica_servers=replica_servers,
+                ))
+                return
+
+            view = memoryview(data)
+            # Parts of a retried upload never mix with this attempt's
+            attempt = generate_uuid()
+
+            def upload_part(offset: int):
+                with view[offset:offset + self.sub_chunk_size] as part:
+                    self._send_upload(UploadChunkRequest(
+                        chunk_id=chunk_id,
+                        data=part,
+                        checksum=checksum,
+                        replica_servers=replica_servers,
+                        offset=offset,
+                        total_size=size,
+                        upload_attempt=attempt,
+                    ))
+
+            offsets = range(0, size, self.sub_chunk_size)
+            with view:
+                try:
+                    if self._part_pool is None:
+                        for offset in offsets:
+                            upload_part(offset)
+                    else:
+                        pool = self._part_pool()
+                        futures = [pool.submit(upload_part, offset) for offset in offsets]
+                        try:
+                            for future in as_completed(futures):
+                                future.result()
+                        finally:
+                            # No part may still be reading the view once it closes
+                            for future in futures:
+                                future.cancel()
+                            wait(futures)
+                except Exception:
+                    self._chunk_server.handle_abort_upload(chunk_id, attempt)
+                    raise
             return
         raise NotImplementedError("RPC not implemented")
 
+    def _send_upload(self, request: UploadChunkRequest):
+        """Send one upload request and raise if it failed."""
+        response = self._chunk_server.handle_upload(request)
+        if not response.success:
+            raise UploadError(response.error)
+
     def download_chunk(self, chunk_id: str):
         """Download a chunk."""
         if self._chunk_server:
@@ -175,22 +340,73 @@ class DFSClient:
         self.metadata = MetadataClient(metadata_addresses)
         self._chunk_clients: Dict[str, ChunkServerClient] = {}
 
+        # Transfer thread pools kept across calls, keyed by worker count
+        self._io_pools: Dict[int, ThreadPoolExecutor] = {}
+        self._io_pools_lock = threading.Lock()
+
+        # Parts of chunks uploaded in pieces. Kept apart from the transfer
+        # pools, whose workers wait on these.
+        self._part_pool: Optional[ThreadPoolExecutor] = None
+
+        # Replica requests for hedged downloads, and recent download times
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self._latencies: deque = deque(maxlen=HEDGE_SAMPLES)
+        self._latencies_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Shut down the client's transfer threads."""
+        with self._io_pools_lock:
+            pools = list(self._io_pools.values())
+            self._io_pools.clear()
+            if self._hedge_pool is not None:
+                pools.append(self._hedge_pool)
+                self._hedge_pool = None
+            if self._part_pool is not None:
+                pools.append(self._part_pool)
+                self._part_pool = None
+        for pool in pools:
+            pool.shutdown(wait=True)
+
+    def _io_pool(self, max_workers: int) -> ThreadPoolExecutor:
+        """Get the shared transfer pool for a worker count, creating it once."""
+        pool = self._io_pools.get(max_workers)
+        if pool is None:
+            with self._io_pools_lock:
+                pool = self._io_pools.get(max_workers)
+                if pool is None:
+                    pool = self._io_pools[max_workers] = ThreadPoolExecutor(
+                        max_workers=max_workers, thread_name_prefix="dfs-io"
+                    )
+        return pool
+
     def set_metadata_service(self, service):
         """Set metadata service for testing."""
         self.metadata.set_metadata_service(service)
 
     def _get_chunk_client(self, server_id: str) -> ChunkServerClient:
         """Get or create chunk server client."""
-        if server_id not in self._chunk_clients:
+        client = self._chunk_clients.get(server_id)
+        if client is None:
             server_info = self.metadata.get_server(server_id)
             address = server_info.address if server_info else server_id
-            self._chunk_clients[server_id] = ChunkServerClient(address)
-        return self._chunk_clients[server_id]
+            # setdefault keeps the first client if worker threads race here
+            client = self._chunk_clients.setdefault(
+                server_id, ChunkServerClient(address, part_pool=self._get_part_pool)
+            )
+        return client
 
     def set_chunk_server(self, server_id: str, server):
         """Set chunk server for testing."""
         if server_id not in self._chunk_clients:
-            self._chunk_clients[server_id] = ChunkServerClient(server_id)
+            self._chunk_clients[server_id] = ChunkServerClient(
+                server_id, part_pool=self._get_part_pool
+            )
         self._chunk_clients[server_id].set_chunk_server(server)
 
     # ─────────────────────────────────────────────────────────────
@@ -209,18 +425,7 @@ class DFSClient:
         """List directory contents."""
         inodes = self.metadata.list_directory(path)
 
-        return [
-            FileInfo(
-                name=inode.name,
-                type=inode.type,
-                size=inode.size,
-                modified=inode.modified_at,
-                created=inode.created_at,
-                owner=inode.owner,
-                version=inode.version,
-            )
-            for inode in inodes
-        ]
+        return [FileInfo(*fields) for fields in map(_file_info_fields, inodes)]
 
     def rmdir(self, path: str, recursive: bool = False) -> bool:
         """Remove a directory."""
@@ -243,34 +448,49 @@ class DFSClient:
 
         try:
             # Step 2: Upload chunks
-            checksums = []
+            num_chunks = len(session.chunks)
+            digests = bytearray(32 * num_chunks)
+            get_client = self._get_chunk_client
+
+            with map_file(local_path) as view, \
+                    ThreadPoolExecutor(max_workers=1) as hasher:
+
+                def hash_chunk(index: int) -> bytes:
+                    offset = index * CHUNK_SIZE
+                    with view[offset:offset + CHUNK_SIZE] as data:
+                        return sha256_bytes(data)
+
+                # Hash the next chunk while the current one uploads
+                pending = hasher.submit(hash_chunk, 0) if session.chunks else None
 
-            with open(local_path, 'rb') as f:
                 for i, allocation in enumerate(session.chunks):
-                    # Read chunk data
-                    data = f.read(CHUNK_SIZE)
-                    checksum = sha256(data)
-                    checksums.append(checksum)
+                    digest = pending.result()
+                    digests[32 * i:32 * i + 32] = digest
+                    checksum = digest.hex()
+                    if i + 1 < num_chunks:
+                        pending = hasher.submit(hash_chunk, i + 1)
 
                     # Upload to primary server (which replicates to others)
                     primary_server = allocation.servers[0]
                     replica_servers = allocation.servers[1:]
 
-                    client = self._get_chunk_client(primary_server)
-                    client.upload_chunk(
-                        chunk_id=allocation.chunk_id,
-                        data=data,
-                        checksum=checksum,
-                        replica_servers=replica_servers,
-                    )
+                    offset = i * CHUNK_SIZE
+                    with view[offset:offset + CHUNK_SIZE] as data:
+                        client = get_client(primary_server)
+                        client.upload_chunk(
+                            chunk_id=allocation.chunk_id,
+                            data=data,
+                            checksum=checksum,
+                            replica_servers=replica_servers,
+                        )
 
                     # Progress callback
                     if progress_callback:
-                        progress = (i + 1) / len(session.chunks) * 100
+                        progress = (i + 1) * 100 / num_chunks
                         progress_callback(progress)
 
             # Step 3: Commit upload
-            self.metadata.commit_upload(session.upload_id, checksums)
+            self.metadata.commit_upload(session.upload_id, hex_checksums(digests))
 
             return True
 
@@ -286,52 +506,62 @@ class DFSClient:
         file_size = os.path.getsize(local_path)
         session = self.metadata.init_upload(remote_path, file_size)
 
-        checksums = [None] * len(session.chunks)
-        completed = [0]
-        lock = __import__('threading').Lock()
+        num_chunks = len(session.chunks)
+        digests = bytearray(32 * num_chunks)
+        uploaded = bytearray(num_chunks)  # Nonzero once a chunk is stored
+        get_client = self._get_chunk_client
+        progress = _ProgressReporter(progress_callback, num_chunks)
+        failed = threading.Event()
 
         def upload_chunk(index: int, allocation: ChunkAllocation):
-            # Read chunk data
-            with open(local_path, 'rb') as f:
-                f.seek(index * CHUNK_SIZE)
-                data = f.read(CHUNK_SIZE)
-
-            checksum = sha256(data)
-            checksums[index] = checksum
-
-            # Upload
-            primary_server = allocation.servers[0]
-            replica_servers = allocation.servers[1:]
-
-            client = self._get_chunk_client(primary_server)
-            client.upload_chunk(
-                chunk_id=allocation.chunk_id,
-                data=data,
-                checksum=checksum,
-                replica_servers=replica_servers,
-            )
-
-            # Progress callback
-            with lock:
-                completed[0] += 1
-                if progress_callback:
-                    progress = completed[0] / len(session.chunks) * 100
-                    progress_callback(progress)
+            if failed.is_set():
+                return  # Another chunk failed; the upload is aborted
+
+            # Slice chunk data out of the shared mapping
+            offset = index * CHUNK_SIZE
+            with view[offset:offset + CHUNK_SIZE] as data:
+                # Each worker hashes its own chunk; hashlib releases the GIL,
+                # so independent chunks are hashed in parallel across workers
+                digest = sha256_bytes(data)
+                digests[32 * index:32 * index + 32] = digest
+                checksum = digest.hex()
+
+                # Upload
+                primary_server = allocation.servers[0]
+                replica_servers = allocation.servers[1:]
+
+                client = get_client(primary_server)
+                client.upload_chunk(
+                    chunk_id=allocation.chunk_id,
+                    data=data,
+                    checksum=checksum,
+                    replica_servers=replica_servers,
+                )
+
+            uploaded[index] = 1
+            progress.advance()
 
         try:
-            # Upload chunks in parallel
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Resolve primary servers up front so workers never hit the
+            # metadata service for client lookups
+            for server_id in {alloc.servers[0] for alloc in session.chunks}:
+                get_client(server_id)
+
+            # Upload chunks in parallel from a single mapping of the file
+            executor = self._io_pool(max_workers)
+            with map_file(local_path) as view:
                 futures = [
                     executor.submit(upload_chunk, i, alloc)
                     for i, alloc in enumerate(session.chunks)
                 ]
 
-                # Wait for all to complete
-                for future in as_completed(futures):
-                    future.result()  # Raises exception if failed
+                # Wait for all to complete, stopping at the first failure
+                self._wait_fail_fast(futures, failed)
 
-            # Commit
-            self.metadata.commit_upload(session.upload_id, checksums)
+            # Commit, but never with a chunk missing
+            if 0 in uploaded:
+                raise UploadError(f"Chunk {uploaded.index(0)} was not uploaded")
+            self.metadata.commit_upload(session.upload_id, hex_checksums(digests))
             return True
 
         except Exception as e:
@@ -349,41 +579,18 @@ class DFSClient:
         inode, chunks = self.metadata.get_file_metadata(remote_path)
 
         # Step 2: Download chunks
+        num_chunks = len(chunks)
         with open(local_path, 'wb') as f:
             for i, chunk in enumerate(chunks):
-                # Try each server until success
-                data = None
-                last_error = None
-
-                for server_id in chunk.servers:
-                    try:
-                        client = self._get_chunk_client(server_id)
-                        response = client.download_chunk(chunk.chunk_id)
-
-                        # Verify checksum
-                        if sha256(response.data) != chunk.checksum:
-                            raise ChecksumMismatchError(
-                                f"Checksum mismatch for chunk {chunk.chunk_id}"
-                            )
-
-                        data = response.data
-                        break
-
-                    except Exception as e:
-                        last_error = e
-                        continue
-
-                if data is None:
-                    raise DownloadError(
-                        f"Failed to download chunk {i}: {last_error}"
-                    )
+                # Try replicas until one returns verified data
+                data = self._download_chunk_data(chunk)
 
                 # Write to file
                 f.write(data)
 
                 # Progress callback
                 if progress_callback:
-                    progress = (i + 1) / len(chunks) * 100
+                    progress = (i + 1) * 100 / num_chunks
                     progress_callback(progress)
 
         return True
@@ -394,56 +601,182 @@ class DFSClient:
         """Download a file with parallel chunk downloads."""
         inode, chunks = self.metadata.get_file_metadata(remote_path)
 
-        # Pre-allocate file
-        with open(local_path, 'wb') as f:
-            f.truncate(inode.size)
+        num_chunks = len(chunks)
+        get_client = self._get_chunk_client
+        progress = _ProgressReporter(progress_callback, num_chunks)
+        failed = threading.Event()
 
-        chunk_data = [None] * len(chunks)
-        completed = [0]
-        lock = __import__('threading').Lock()
+        # Resolve first-choice servers up front (see put_parallel)
+        for server_id in {chunk.servers[0] for chunk in chunks if chunk.servers}:
+            get_client(server_id)
 
         def download_chunk(index: int, chunk: Chunk):
-            for server_id in chunk.servers:
-                try:
-                    client = self._get_chunk_client(server_id)
-                    response = client.download_chunk(chunk.chunk_id)
+            # Verified on the worker so checks overlap other downloads
+            data = self._download_chunk_data(chunk, failed)
 
-                    if sha256(response.data) != chunk.checksum:
-                        continue
+            # Positional write: no shared file offset, so no lock
+            self._pwrite_all(fd, data, index * CHUNK_SIZE)
 
-                    chunk_data[index] = response.data
+            progress.advance()
 
-                    # Progress callback
-                    with lock:
-                        completed[0] += 1
-                        if progress_callback:
-                            progress = completed[0] / len(chunks) * 100
-                            progress_callback(progress)
-                    return
-
-                except Exception:
-                    continue
-
-            raise DownloadError(f"Failed to download chunk {index}")
+        # Pre-allocate file; workers write chunks straight into place
+        fd = os.open(local_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            os.ftruncate(fd, inode.size)
 
-        # Download in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Download in parallel
+            executor = self._io_pool(max_workers)
             futures = [
                 executor.submit(download_chunk, i, chunk)
                 for i, chunk in enumerate(chunks)
             ]
 
-            for future in as_completed(futures):
-                future.result()
-
-        # Write all chunks to file
-        with open(local_path, 'r+b') as f:
-            for i, data in enumerate(chunk_data):
-                f.seek(i * CHUNK_SIZE)
-                f.write(data)
+            self._wait_fail_fast(futures, failed)
+        finally:
+            os.close(fd)
 
         return True
 
+    def _download_chunk_data(self, chunk: Chunk,
+                             failed: Optional[threading.Event] = None) -> bytes:
+        """Download and verify a chunk, hedging across its replicas.
+
+        A request goes to the first replica. If it fails, or is still
+        running after the hedge delay, the next replica is asked as well and
+        the first verified response wins. The delay counts from when a
+        worker starts the request, not from when it was queued, so a busy
+        pool does not make every request look like a straggler. A straggler
+        that already started cannot be interrupted; its result is simply
+        ignored.
+        """
+        pool = self._get_hedge_pool()
+        servers = iter(chunk.servers)
+        pending = set()
+        last_error = None
+        started_at = []  # Start time of the latest request, once running
+
+        def start_next() -> bool:
+            nonlocal started_at
+            started_at = []  # Out of replicas: nothing left to hedge with
+            server_id = next(servers, None)
+            if server_id is None:
+                return False
+            pending.add(pool.submit(
+                self._fetch_verified, server_id, chunk, started_at
+            ))
+            return True
+
+        start_next()
+        while pending:
+            if failed is not None and failed.is_set():
+                break  # Another chunk failed; stop trying replicas
+
+            delay = self._hedge_delay()
+            timeout = delay
+            if started_at:
+                timeout = max(0.0, started_at[0] + delay - time.monotonic())
+
+            done, _ = wait(pending, timeout=timeout,
+                           return_when=FIRST_COMPLETED)
+            if not done:
+                if started_at and time.monotonic() - started_at[0] >= delay:
+                    start_next()  # Straggler: hedge with the next replica
+                continue  # Otherwise still queued, or not late yet
+
+            for future in done:
+                pending.discard(future)
+                try:
+                    data = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                for other in pending:
+                    other.cancel()
+                return data
+
+            start_next()  # A replica failed; try the next one now
+
+        raise DownloadError(
+            f"Failed to download chunk {chunk.chunk_index}: {last_error}"
+        )
+
+    def _fetch_verified(self, server_id: str, chunk: Chunk,
+                        started_at: Optional[list] = None) -> bytes:
+        """Fetch a chunk from one replica and verify its checksum.
+
+        The start time is appended to started_at, if given, as the request
+        begins to run.
+        """
+        started = time.monotonic()
+        if started_at is not None:
+            started_at.append(started)
+        client = self._get_chunk_client(server_id)
+        response = client.download_chunk(chunk.chunk_id)
+
+        if not checksum_matches(response.data, chunk.checksum):
+            raise ChecksumMismatchError(
+                f"Checksum mismatch for chunk {chunk.chunk_id}"
+            )
+
+        with self._latencies_lock:
+            self._latencies.append(time.monotonic() - started)
+        return response.data
+
+    def _hedge_delay(self) -> float:
+        """Seconds to wait on a replica before asking the next one."""
+        with self._latencies_lock:
+            if len(self._latencies) < HEDGE_MIN_SAMPLES:
+                return HEDGE_DELAY_DEFAULT
+            samples = sorted(self._latencies)
+        return samples[int(len(samples) * 0.95)]
+
+    def _get_part_pool(self) -> ThreadPoolExecutor:
+        """Get the pool that sends the parts of chunks uploaded in pieces."""
+        if self._part_pool is None:
+            with self._io_pools_lock:
+                if self._part_pool is None:
+                    self._part_pool = ThreadPoolExecutor(
+                        max_workers=PART_UPLOAD_WORKERS, thread_name_prefix="dfs-part"
+                    )
+        return self._part_pool
+
+    def _get_hedge_pool(self) -> ThreadPoolExecutor:
+        """Get the pool that runs individual replica requests."""
+        if self._hedge_pool is None:
+            with self._io_pools_lock:
+                if self._hedge_pool is None:
+                    self._hedge_pool = ThreadPoolExecutor(
+                        max_workers=HEDGE_WORKERS, thread_name_prefix="dfs-hedge"
+                    )
+        return self._hedge_pool
+
+    @staticmethod
+    def _wait_fail_fast(futures: list, failed: threading.Event):
+        """Wait for chunk transfers, cancelling the rest once one fails.
+
+        Queued transfers are cancelled and in-flight workers see `failed`
+        set, so no more chunk data is moved before the error is raised.
+        Returns only once no worker still uses the caller's file or mapping.
+        """
+        done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+        if not_done:
+            failed.set()
+            for future in not_done:
+                future.cancel()
+            wait(not_done)
+
+        for future in done:
+            future.result()  # Raises exception if failed
+
+    @staticmethod
+    def _pwrite_all(fd: int, data: bytes, offset: int):
+        """Write data at an offset, retrying short writes."""
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+
     # ─────────────────────────────────────────────────────────────
     # FILE OPERATIONS
     # ─────────────────────────────────────────────────────────────
@@ -466,15 +799,7 @@ class DFSClient:
         if inode is None:
             raise NotFoundError(f"Not found: {path}")
 
-        return FileInfo(
-            name=inode.name,
-            type=inode.type,
-            size=inode.size,
-            created=inode.created_at,
-            modified=inode.modified_at,
-            owner=inode.owner,
-            version=inode.version,
-        )
+        return FileInfo(*_file_info_fields(inode))
 
     # ─────────────────────────────────────────────────────────────
     # RESUMABLE UPLOAD
@@ -502,48 +827,52 @@ class DFSClient:
                 upload_id=session.upload_id,
                 remote_path=remote_path,
                 completed_chunks=[],
-                checksums=[None] * len(session.chunks),
+                checksums=bytearray(32 * len(session.chunks)),
             )
 
         completed_chunks = set(state.completed_chunks)
-        checksums = state.checksums
+        digests = state.checksums
+        num_chunks = len(session.chunks)
+        get_client = self._get_chunk_client
+        progress = _ProgressReporter(
+            progress_callback, num_chunks, len(completed_chunks)
+        )
+        unsaved = 0
 
         try:
-            with open(local_path, 'rb') as f:
+            with map_file(local_path) as view:
                 for i, allocation in enumerate(session.chunks):
                     if i in completed_chunks:
                         continue  # Already uploaded
 
-                    # Read and upload chunk
-                    f.seek(i * CHUNK_SIZE)
-                    data = f.read(CHUNK_SIZE)
-                    checksum = sha256(data)
-                    checksums[i] = checksum
-
-                    primary_server = allocation.servers[0]
-                    client = self._get_chunk_client(primary_server)
-                    client.upload_chunk(
-                        chunk_id=allocation.chunk_id,
-                        data=data,
-                        checksum=checksum,
-                        replica_servers=allocation.servers[1:],
-                    )
+                    # Slice and upload chunk
+                    offset = i * CHUNK_SIZE
+                    with view[offset:offset + CHUNK_SIZE] as data:
+                        digest = sha256_bytes(data)
+                        digests[32 * i:32 * i + 32] = digest
+                        checksum = digest.hex()
+
+                        primary_server = allocation.servers[0]
+                        client = get_client(primary_server)
+                        client.upload_chunk(
+                            chunk_id=allocation.chunk_id,
+                            data=data,
+                            checksum=checksum,
+                            replica_servers=allocation.servers[1:],
+                        )
 
                     # Update state
                     completed_chunks.add(i)
                     state.completed_chunks.append(i)
-                    state.checksums = checksums
-
-                    if state_file:
+                    unsaved += 1
+                    if state_file and unsaved >= UPLOAD_STATE_SAVE_INTERVAL:
                         self._save_upload_state(state_file, state)
+                        unsaved = 0
 
-                    # Progress callback
-                    if progress_callback:
-                        progress = len(completed_chunks) / len(session.chunks) * 100
-                        progress_callback(progress)
+                    progress.advance()
 
             # Commit
-            self.metadata.commit_upload(session.upload_id, checksums)
+            self.metadata.commit_upload(session.upload_id, hex_checksums(digests))
 
             # Clean up state file
             if state_file and os.path.exists(state_file):
@@ -552,20 +881,47 @@ class DFSClient:
             return True
 
         except Exception as e:
-            # State is saved, can resume later
+            # Save progress since the last checkpoint, can resume later
+            if state_file and unsaved:
+                self._save_upload_state(state_file, state)
             raise UploadError(f"Upload failed (resumable): {e}")
 
     def _load_upload_state(self, state_file: str) -> Optional[UploadState]:
-        """Load upload state from file."""
-        if not os.path.exists(state_file):
-            return None
+        """Load upload state from file.
 
+        Returns None if there is no state file or it does not match the
+        expected schema, in which case the upload starts over.
+        """
         try:
-            with open(state_file, 'r') as f:
-                data = json.load(f)
-            return UploadState(**data)
-        except Exception:
+            with open(state_file, 'rb') as f:
+                data = json.loads(f.read())
+
+            upload_id = data['upload_id']
+            remote_path = data['remote_path']
+            completed_chunks = data['completed_chunks']
+            checksums = data['checksums']
+            if not (isinstance(upload_id, str) and isinstance(remote_path, str)
+                    and isinstance(completed_chunks, list)
+                    and all(type(i) is int for i in completed_chunks)):
+                raise ValueError("unexpected field types")
+
+            if isinstance(checksums, list):
+                # Older state files stored a hex string (or None) per chunk
+                digests = bytearray().join(
+                    bytes.fromhex(c) if c else bytes(32) for c in checksums
+                )
+            else:
+                digests = bytearray(base64.b64decode(checksums, validate=True))
+            if len(digests) % 32:
+                raise ValueError("truncated checksums")
+
+        except FileNotFoundError:
             return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring invalid upload state {state_file}: {e}")
+            return None
+
+        return UploadState(upload_id, remote_path, completed_chunks, digests)
 
     def _save_upload_state(self, state_file: str, state: UploadState):
         """Save upload state to file."""
@@ -573,7 +929,12 @@ class DFSClient:
             'upload_id': state.upload_id,
             'remote_path': state.remote_path,
             'completed_chunks': state.completed_chunks,
-            'checksums': state.checksums,
+            'checksums': base64.b64encode(state.checksums).decode('ascii'),
         }
-        with open(state_file, 'w') as f:
-            json.dump(data, f)
+        # Write a temp file and rename it so a crash never leaves a torn state
+        temp_path = f"{state_file}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(json.dumps(data, separators=(',', ':')))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, state_file)
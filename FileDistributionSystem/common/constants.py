@@ -3,12 +3,14 @@
 # Chunk configuration
 CHUNK_SIZE = 64 * 1024 * 1024  # 64 MB
 REPLICATION_FACTOR = 3
+SUB_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB; larger chunks upload as parallel parts
 
 # Timing configuration
 HEARTBEAT_INTERVAL = 10  # seconds
 ELECTION_TIMEOUT_MIN = 150  # ms
 ELECTION_TIMEOUT_MAX = 300  # ms
 SERVER_TIMEOUT = 30  # seconds before marking server offline
+SCRUB_INTERVAL = 60 * 60 * 24  # seconds per full chunk scrub pass
 
 # Root inode
 ROOT_INODE_ID = 1
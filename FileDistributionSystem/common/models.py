@@ -3,10 +3,11 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional
+import os
 import uuid
 
 
-@dataclass
+@dataclass(slots=True)
 class Inode:
     """Represents a file or directory in the file system."""
     inode_id: int
@@ -28,7 +29,7 @@ class Inode:
         return self.type == "DIRECTORY"
 
 
-@dataclass
+@dataclass(slots=True)
 class Chunk:
     """Represents a chunk of a file."""
     chunk_id: str  # UUID
@@ -40,7 +41,7 @@ class Chunk:
     servers: List[str]  # server_ids holding this chunk
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkServer:
     """Represents a chunk storage server."""
     server_id: str
@@ -56,7 +57,7 @@ class ChunkServer:
         return self.capacity - self.used
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChunkAllocation:
     """Allocation plan for a single chunk during upload."""
     chunk_index: int
@@ -64,7 +65,7 @@ class ChunkAllocation:
     servers: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class UploadSession:
     """Represents an in-progress file upload."""
     upload_id: str
@@ -76,7 +77,7 @@ class UploadSession:
     expires_at: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkInfo:
     """Local chunk information on a chunk server."""
     chunk_id: str
@@ -85,15 +86,16 @@ class ChunkInfo:
     created_at: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkGCEntry:
     """Entry in the chunk garbage collection queue."""
     chunk_id: str
     servers: List[str]
     delete_after: datetime
+    attempts: int = 0  # Failed deletion attempts so far
 
 
-@dataclass
+@dataclass(slots=True)
 class FileInfo:
     """File information returned to clients."""
     name: str
@@ -105,16 +107,16 @@ class FileInfo:
     version: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class UploadState:
     """State for resumable uploads."""
     upload_id: str
     remote_path: str
     completed_chunks: List[int] = field(default_factory=list)
-    checksums: List[Optional[str]] = field(default_factory=list)
+    checksums: bytearray = field(default_factory=bytearray)  # 32-byte SHA-256 per chunk
 
 
-@dataclass
+@dataclass(slots=True)
 class LogEntry:
     """Raft log entry."""
     term: int
@@ -122,7 +124,7 @@ class LogEntry:
     index: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Command:
     """Command to be replicated via Raft."""
     type: str
@@ -132,9 +134,10 @@ class Command:
     name: Optional[str] = None
     child_id: Optional[int] = None
     chunk: Optional[Chunk] = None
+    ops: Optional[List['Command']] = None  # Sub-commands of a BATCH command
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VoteRequest:
     """Raft RequestVote RPC."""
     term: int
@@ -143,14 +146,14 @@ class VoteRequest:
     last_log_term: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VoteResponse:
     """Raft RequestVote RPC response."""
     term: int
     vote_granted: bool
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AppendEntriesRequest:
     """Raft AppendEntries RPC."""
     term: int
@@ -161,36 +164,43 @@ class AppendEntriesRequest:
     leader_commit: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AppendEntriesResponse:
     """Raft AppendEntries RPC response."""
     term: int
     success: bool
+    # On rejection: where the leader should retry from, and the term of the
+    # follower's conflicting entry (None if its log was just too short)
+    conflict_index: Optional[int] = None
+    conflict_term: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UploadChunkRequest:
     """Request to upload a chunk."""
     chunk_id: str
     data: bytes
-    checksum: str
+    checksum: str  # Of the whole chunk
     replica_servers: List[str]
+    offset: int = 0  # Where data starts within the chunk
+    total_size: Optional[int] = None  # Set when data is one part of the chunk
+    upload_attempt: Optional[str] = None  # Shared by the parts of one attempt
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UploadChunkResponse:
     """Response from chunk upload."""
     success: bool
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DownloadChunkRequest:
     """Request to download a chunk."""
     chunk_id: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DownloadChunkResponse:
     """Response from chunk download."""
     data: bytes
@@ -200,3 +210,12 @@ class DownloadChunkResponse:
 def generate_uuid() -> str:
     """Generate a new UUID string."""
     return str(uuid.uuid4())
+
+
+def generate_uuids(count: int) -> List[str]:
+    """Generate `count` random UUID strings from a single urandom read."""
+    raw = os.urandom(16 * count)
+    return [
+        str(uuid.UUID(bytes=raw[i:i + 16], version=4))
+        for i in range(0, 16 * count, 16)
+    ]
@@ -74,6 +74,13 @@ def main():
             )
         print(f"    - {len(chunk_servers)} chunk servers started")
 
+        # All servers share this host's filesystem, so replicas are copied
+        # locally instead of through the replication RPC
+        for server in chunk_servers:
+            for peer in chunk_servers:
+                if peer is not server:
+                    server.set_local_peer(peer.server_id, peer)
+
         # Initialize client
         client = DFSClient(metadata_addresses=["localhost:9000"])
         client.set_metadata_service(metadata_service)
@@ -1,19 +1,288 @@
 """Background service for cleaning up deleted files and orphaned chunks."""
 
+import asyncio
+import hashlib
+import heapq
+import itertools
+import math
 import threading
 import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from queue import Queue, Empty, PriorityQueue
-from typing import List, Set
+from queue import Empty, Full, Queue
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from common.constants import (
     FileType,
     FileStatus,
     GC_GRACE_PERIOD_HOURS,
 )
-from common.models import ChunkGCEntry
+from common.models import ChunkGCEntry, Inode
 from .storage import MetadataStorage
 
+# Most chunk IDs sent to a chunk server in one delete request
+GC_DELETE_BATCH_SIZE = 1000
+
+# Backoff for re-trying failed chunk deletions (doubles per attempt)
+GC_RETRY_BASE_SECONDS = 60
+GC_RETRY_MAX_SECONDS = 60 * 60
+
+# Limits that keep chunk deletion from flooding chunk server disks
+GC_MAX_CONCURRENT_DELETES = 3  # Delete requests in flight at once
+GC_DELETE_RATE = 1000  # Chunks deleted per second across all servers
+
+# Directory entries one deletion pass handles before re-queuing the rest
+GC_SUBTREE_BUDGET = 50000
+
+# How long subtree deletion backs off after another subsystem reports load
+GC_PRESSURE_BACKOFF_SECONDS = 0.01
+
+# Chunk GC entries a thread buffers before handing them to the queue
+GC_FLUSH_THRESHOLD = 256
+
+# Most chunk GC entries taken off the queue per wakeup
+GC_DRAIN_MAX = 10000
+
+# Most spare ChunkGCEntry objects kept for reuse
+GC_ENTRY_POOL_SIZE = 65536
+
+# Chunk server listings in flight at once during the orphan scan
+ORPHAN_SCAN_CONCURRENCY = 64
+
+# Known-chunk Bloom filter for the orphan scan. A false positive only keeps
+# an orphan alive until a later scan, so a small error rate is enough.
+ORPHAN_BLOOM_CAPACITY = 1 << 20
+ORPHAN_BLOOM_ERROR_RATE = 1e-4
+
+# Read-ahead for the replication scan: batches of decoded chunk records
+REPLICATION_PREFETCH_BATCH = 256
+REPLICATION_PREFETCH_BATCHES = 4
+
+
+class _WorkQueue:
+    """Multi-producer, single-consumer queue with a high-priority lane.
+
+    deque append/popleft are atomic, so producers never take a lock; an
+    Event wakes the one consumer thread. Only that thread may call get().
+    """
+
+    __slots__ = ('_high', '_low', '_ready')
+
+    def __init__(self):
+        self._high: deque = deque()
+        self._low: deque = deque()
+        self._ready = threading.Event()
+
+    def put(self, item: Any, high: bool = True):
+        """Add an item to the high or low priority lane."""
+        (self._high if high else self._low).append(item)
+        self._ready.set()
+
+    def put_many(self, items: List[Any], high: bool = True):
+        """Add several items to one lane with a single wakeup."""
+        (self._high if high else self._low).extend(items)
+        self._ready.set()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Pop the next item, high lane first. Raises Empty on timeout."""
+        while True:
+            if self._high:
+                return self._high.popleft()
+            if self._low:
+                return self._low.popleft()
+
+            self._ready.clear()
+            if self._high or self._low:
+                continue  # Put raced with clear()
+            if not self._ready.wait(timeout):
+                raise Empty
+
+    def get_many(self, max_items: int, timeout: Optional[float] = None) -> List[Any]:
+        """Wait for one item, then take up to `max_items` without blocking."""
+        items = [self.get(timeout)]
+        high, low = self._high, self._low
+        while len(items) < max_items and (high or low):
+            items.append(high.popleft() if high else low.popleft())
+        return items
+
+    def empty(self) -> bool:
+        return not (self._high or self._low)
+
+    def __len__(self) -> int:
+        return len(self._high) + len(self._low)
+
+
+class _BloomFilter:
+    """Fixed-capacity Bloom filter over pre-hashed keys, backed by a bytearray."""
+
+    __slots__ = ('capacity', 'count', '_size', '_hashes', '_bits')
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.count = 0
+        self._size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def _positions(self, h1: int, h2: int):
+        # Double hashing: all k positions come from one pair of 64-bit hashes
+        size = self._size
+        return ((h1 + i * h2) % size for i in range(self._hashes))
+
+    def add(self, h1: int, h2: int):
+        bits = self._bits
+        for pos in self._positions(h1, h2):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def contains(self, h1: int, h2: int) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(h1, h2))
+
+
+def _key_hashes(key: str) -> Tuple[int, int]:
+    """Hash a key once into the two 64-bit integers every filter probes with."""
+    digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+class _ScalableBloomFilter:
+    """Bloom filter that adds larger, stricter filters as it fills up."""
+
+    __slots__ = ('_error_rate', '_filters')
+
+    def __init__(self, capacity: int, error_rate: float):
+        self._error_rate = error_rate / 2  # Series of halving rates sums to error_rate
+        self._filters = [_BloomFilter(capacity, self._error_rate)]
+
+    def add(self, key: str):
+        current = self._filters[-1]
+        if current.count >= current.capacity:
+            self._error_rate /= 2
+            current = _BloomFilter(current.capacity * 2, self._error_rate)
+            self._filters.append(current)
+        current.add(*_key_hashes(key))
+
+    def __contains__(self, key: str) -> bool:
+        # Hash once, then probe every filter with the same integers
+        h1, h2 = _key_hashes(key)
+        return any(f.contains(h1, h2) for f in self._filters)
+
+    def __len__(self) -> int:
+        return sum(f.count for f in self._filters)
+
+
+def _prefetch(items: Iterable[Any], batch_size: int, max_batches: int) -> Iterator[Any]:
+    """Iterate `items` on a background thread, up to `max_batches` batches ahead.
+
+    The producer stops early if the consumer abandons the iterator, and
+    exceptions raised while producing are re-raised in the consumer.
+    """
+    batches: Queue = Queue(maxsize=max_batches)
+    stop = threading.Event()
+    done = object()
+
+    def offer(batch) -> bool:
+        while not stop.is_set():
+            try:
+                batches.put(batch, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce():
+        batch = []
+        try:
+            for item in items:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    if not offer(batch):
+                        return
+                    batch = []
+            if batch and not offer(batch):
+                return
+            offer(done)
+        except Exception as e:
+            offer(e)
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            batch = batches.get()
+            if batch is done:
+                return
+            if isinstance(batch, Exception):
+                raise batch
+            yield from batch
+    finally:
+        stop.set()
+
+
+class _ChunkGCEntryPool:
+    """Freelist of ChunkGCEntry objects, so steady deletion allocates none."""
+
+    __slots__ = ('_free', '_max_size', '_lock')
+
+    def __init__(self, max_size: int = GC_ENTRY_POOL_SIZE):
+        self._free: List[ChunkGCEntry] = []
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    def acquire(self, chunk_id: str, servers: List[str], delete_after: datetime,
+                attempts: int = 0) -> ChunkGCEntry:
+        """Return a recycled entry filled in with these values, or a new one."""
+        with self._lock:
+            entry = self._free.pop() if self._free else None
+        if entry is None:
+            return ChunkGCEntry(chunk_id, servers, delete_after, attempts)
+
+        entry.chunk_id = chunk_id
+        entry.servers = servers
+        entry.delete_after = delete_after
+        entry.attempts = attempts
+        return entry
+
+    def release(self, entries: List[ChunkGCEntry]):
+        """Return entries nothing references any more to the freelist."""
+        with self._lock:
+            room = self._max_size - len(self._free)
+            if room > 0:
+                self._free.extend(entries[:room])
+
+
+class _TokenBucket:
+    """Blocking token bucket for rate limiting."""
+
+    __slots__ = ('rate', 'capacity', '_tokens', '_last_refill', '_lock')
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float):
+        """Take tokens, waiting until enough have accumulated."""
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._last_refill) * self.rate,
+                )
+                self._last_refill = now
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+
+            time.sleep(wait)
+
 
 class GarbageCollector:
     """Background service for cleaning up deleted files and orphaned chunks."""
@@ -22,8 +291,23 @@ class GarbageCollector:
         self.storage = storage
 
         # Queues
-        self.deletion_queue: PriorityQueue = PriorityQueue()
-        self.chunk_gc_queue: Queue = Queue()
+        self.deletion_queue = _WorkQueue()  # Inode IDs
+        self.chunk_gc_queue = _WorkQueue()  # ChunkGCEntry
+        self._gc_buffers = threading.local()  # Per-thread ChunkGCEntry batches
+        self._entry_pool = _ChunkGCEntryPool()
+
+        # Deletion throttling
+        self._delete_sem = threading.BoundedSemaphore(GC_MAX_CONCURRENT_DELETES)
+        self._delete_bucket = _TokenBucket(
+            GC_DELETE_RATE, max(GC_DELETE_RATE, GC_DELETE_BATCH_SIZE)
+        )
+        # Sends delete batches to different servers concurrently
+        self._delete_pool = ThreadPoolExecutor(
+            max_workers=GC_MAX_CONCURRENT_DELETES, thread_name_prefix="gc-delete"
+        )
+
+        # Set by busy subsystems (heartbeats, Raft apply) to make deletion back off
+        self._pressure = threading.Event()
 
         # Running state
         self._running = False
@@ -32,6 +316,7 @@ class GarbageCollector:
     def start(self):
         """Start garbage collection background threads."""
         self._running = True
+        self._recover_queues()
 
         self._threads = [
             threading.Thread(target=self._process_deletions, daemon=True),
@@ -45,14 +330,34 @@ class GarbageCollector:
     def stop(self):
         """Stop garbage collection."""
         self._running = False
+        self._delete_pool.shutdown(wait=False)
+
+    def report_pressure(self):
+        """Ask background deletion to back off briefly (called under load)."""
+        self._pressure.set()
 
     def queue_deletion(self, inode_id: int, priority: int = 0):
-        """Queue an inode for deletion."""
-        self.deletion_queue.put((priority, inode_id))
+        """Queue an inode for deletion (priority 0 is served first)."""
+        self.storage.add_pending_deletions([inode_id])
+        self.deletion_queue.put(inode_id, high=priority <= 0)
 
     def queue_subtree_deletion(self, inode_id: int):
         """Queue a subtree for deletion."""
-        self.deletion_queue.put((0, inode_id))
+        self.storage.add_pending_deletions([inode_id])
+        self.deletion_queue.put(inode_id)
+
+    def _recover_queues(self):
+        """Reload the work recorded in storage before the last shutdown."""
+        pending = self.storage.list_pending_deletions()
+        for inode_id in pending:
+            self.deletion_queue.put(inode_id)
+
+        entries = list(self.storage.scan_gc_entries())
+        self.chunk_gc_queue.put_many(entries)
+
+        if pending or entries:
+            print(f"Recovered {len(pending)} pending deletions and "
+                  f"{len(entries)} chunk GC entries")
 
     # ─────────────────────────────────────────────────────────────
     # DIRECTORY DELETION (LAZY)
@@ -62,84 +367,146 @@ class GarbageCollector:
         """Process queued directory deletions."""
         while self._running:
             try:
-                _, inode_id = self.deletion_queue.get(timeout=1)
+                inode_id = self.deletion_queue.get(timeout=1)
             except Empty:
                 continue
 
             try:
                 inode = self.storage.get_inode(inode_id)
                 if inode is None:
+                    self.storage.remove_pending_deletion(inode_id)
                     continue
 
                 if inode.type == FileType.DIRECTORY:
-                    self._delete_directory_contents(inode_id)
+                    if not self._delete_directory_contents(inode_id):
+                        continue  # Re-queued; the inode goes when it is empty
                 else:
                     self._delete_file_chunks(inode_id)
 
                 # Delete the inode itself
                 self.storage.delete_inode(inode_id)
+                self.storage.remove_pending_deletion(inode_id)
 
             except Exception as e:
                 print(f"Error processing deletion for inode {inode_id}: {e}")
                 # Re-queue with lower priority
-                self.deletion_queue.put((1, inode_id))
+                self.deletion_queue.put(inode_id, high=False)
+
+            finally:
+                # Quiescent point: hand over whatever this inode produced
+                self._flush_chunk_gc()
 
-    def _delete_directory_contents(self, dir_inode_id: int):
-        """Recursively delete directory contents."""
+    def _delete_directory_contents(self, dir_inode_id: int) -> bool:
+        """Delete a directory's whole subtree in one depth-first traversal.
+
+        Sub-directories go on a local stack rather than back through the
+        deletion queue. After GC_SUBTREE_BUDGET entries the directories still
+        on the stack are re-queued. Returns False if that includes this one.
+        """
         batch_size = 1000
+        budget = GC_SUBTREE_BUDGET
+        stack = [dir_inode_id]
 
-        while True:
-            children = self.storage.list_children(dir_inode_id)[:batch_size]
+        while stack:
+            if budget <= 0:
+                # Hand what is left back to the queue so other work can run
+                for inode_id in stack:
+                    self.deletion_queue.put(inode_id, high=False)
+                return False
+
+            current = stack[-1]
+            # Processed entries are removed, so each batch starts from the front
+            children = list(self.storage.iter_children(current, limit=batch_size))
 
             if not children:
-                break
+                stack.pop()
+                if current != dir_inode_id:
+                    self.storage.delete_inode(current)
+                    self.storage.remove_pending_deletion(current)
+                continue
+            budget -= len(children)
 
-            for child_name, child_id in children:
-                child = self.storage.get_inode(child_id)
+            # One read for the whole batch of child inodes
+            inodes = self.storage.get_inodes([child_id for _, child_id in children])
+            file_ids = []
+            dir_ids = []
 
+            for child_name, child_id in children:
+                child = inodes.get(child_id)
                 if child is None:
-                    self.storage.remove_child(dir_inode_id, child_name)
                     continue
 
                 if child.type == FileType.DIRECTORY:
-                    # Queue subdirectory for deletion
-                    self.deletion_queue.put((time.time(), child_id))
+                    # Descend into the subdirectory next
+                    dir_ids.append(child_id)
                 else:
                     # Queue file chunks for deletion
-                    self._delete_file_chunks(child_id)
-                    self.storage.delete_inode(child_id)
+                    self._delete_inode_chunks(child)
+                    file_ids.append(child_id)
 
-                # Remove from parent
-                self.storage.remove_child(dir_inode_id, child_name)
+            # Record subdirectories before unlinking them, so a restart
+            # still finds them
+            self.storage.add_pending_deletions(dir_ids)
+            stack.extend(dir_ids)
 
-            # Yield to prevent starving other operations
-            time.sleep(0.01)
+            # Then one write each for the file inodes and the parent entries
+            self.storage.delete_inodes(file_ids)
+            self.storage.remove_children(
+                current, [child_name for child_name, _ in children]
+            )
+
+            # Back off only when another subsystem has reported load
+            if self._pressure.is_set():
+                self._pressure.clear()
+                time.sleep(GC_PRESSURE_BACKOFF_SECONDS)
+
+        return True
 
     def _delete_file_chunks(self, inode_id: int):
         """Queue all chunks of a file for deletion."""
         inode = self.storage.get_inode(inode_id)
-        if inode is None:
-            return
-
-        # Delete all versions
-        for version in range(1, inode.version + 1):
-            chunks = self.storage.get_chunks(inode_id, version)
-
-            for chunk in chunks:
-                # Decrement reference count
-                ref_count = self.storage.decrement_chunk_ref(chunk.chunk_id)
-
-                if ref_count <= 0:
-                    # Queue for physical deletion
-                    entry = ChunkGCEntry(
-                        chunk_id=chunk.chunk_id,
-                        servers=chunk.servers,
-                        delete_after=datetime.now() + timedelta(hours=GC_GRACE_PERIOD_HOURS),
-                    )
-                    self.chunk_gc_queue.put(entry)
+        if inode is not None:
+            self._delete_inode_chunks(inode)
+
+    def _delete_inode_chunks(self, inode: Inode):
+        """Queue all chunks of an already loaded file inode for deletion."""
+        inode_id = inode.inode_id
+        delete_after = datetime.now() + timedelta(hours=GC_GRACE_PERIOD_HOURS)
+
+        # All versions at once: one scan, one ref-count write, one delete
+        chunks = self.storage.get_inode_chunks(inode_id)
+        ref_counts = self.storage.decrement_chunk_refs([c.chunk_id for c in chunks])
+
+        # Queue unreferenced chunks for physical deletion
+        entries = [
+            self._entry_pool.acquire(chunk.chunk_id, chunk.servers, delete_after)
+            for chunk, ref_count in zip(chunks, ref_counts)
+            if ref_count <= 0
+        ]
 
-            # Delete chunk metadata
-            self.storage.delete_chunks(inode_id, version)
+        # Record the GC entries before the chunk metadata goes, so a
+        # restart in between cannot leave the chunks orphaned
+        self.storage.put_gc_entries(entries)
+        self.storage.delete_inode_chunks(inode_id)
+
+        for entry in entries:
+            self._buffer_chunk_gc(entry)
+
+    def _buffer_chunk_gc(self, entry: ChunkGCEntry):
+        """Add an entry to this thread's GC buffer, flushing it when full."""
+        buffer = getattr(self._gc_buffers, 'entries', None)
+        if buffer is None:
+            buffer = self._gc_buffers.entries = []
+        buffer.append(entry)
+        if len(buffer) >= GC_FLUSH_THRESHOLD:
+            self._flush_chunk_gc()
+
+    def _flush_chunk_gc(self):
+        """Move this thread's buffered GC entries to the shared queue."""
+        buffer = getattr(self._gc_buffers, 'entries', None)
+        if buffer:
+            self.chunk_gc_queue.put_many(buffer)
+            self._gc_buffers.entries = []
 
     # ─────────────────────────────────────────────────────────────
     # CHUNK PHYSICAL DELETION
@@ -147,36 +514,99 @@ class GarbageCollector:
 
     def _process_chunk_gc(self):
         """Delete chunks from chunk servers after grace period."""
-        pending: List[ChunkGCEntry] = []
+        # Min-heap by monotonic deadline; seq breaks ties without comparing entries.
+        # Each entry's datetime is converted once on arrival, so the loop itself
+        # only compares floats.
+        pending: List[Tuple[float, int, ChunkGCEntry]] = []
+        seq = itertools.count()
 
         while self._running:
-            # Check pending entries
-            now = datetime.now()
-            ready = [e for e in pending if e.delete_after <= now]
-            pending = [e for e in pending if e.delete_after > now]
+            # Pop only the entries that are due
+            now = time.monotonic()
+            ready = []
+            while pending and pending[0][0] <= now:
+                ready.append(heapq.heappop(pending)[2])
 
             # Process ready entries
-            for entry in ready:
-                self._delete_chunk_from_servers(entry)
-
-            # Get new entries
+            if ready:
+                try:
+                    self._delete_chunks_from_servers(ready)
+                except RuntimeError:
+                    # Delete pool shut down by stop(); the entries are still
+                    # recorded in storage and are picked up on restart
+                    break
+                # Retries were recorded as fresh entries, so these can go
+                self.storage.delete_gc_entries(ready)
+                self._entry_pool.release(ready)
+
+            # Get new entries, waking no later than the next one is due
+            timeout = 1.0
+            if pending:
+                timeout = min(max(pending[0][0] - time.monotonic(), 0.0), timeout)
             try:
-                entry = self.chunk_gc_queue.get(timeout=1)
-                pending.append(entry)
+                entries = self.chunk_gc_queue.get_many(GC_DRAIN_MAX, timeout=timeout)
             except Empty:
-                pass
+                continue
 
-    def _delete_chunk_from_servers(self, entry: ChunkGCEntry):
-        """Delete chunk from all chunk servers."""
-        for server_id in entry.servers:
-            try:
-                # In production, this would be an RPC call to the chunk server
-                # client = self.get_chunk_server_client(server_id)
-                # client.delete_chunk(entry.chunk_id)
-                print(f"Would delete chunk {entry.chunk_id} from {server_id}")
-            except Exception as e:
-                print(f"Failed to delete chunk {entry.chunk_id} from {server_id}: {e}")
-                # Will be cleaned up by orphan scanner
+            # Drain a whole burst per wakeup, reading both clocks once
+            wall_now, mono_now = datetime.now(), time.monotonic()
+            for entry in entries:
+                delay = (entry.delete_after - wall_now).total_seconds()
+                heapq.heappush(pending, (mono_now + delay, next(seq), entry))
+
+    def _delete_chunks_from_servers(self, entries: List[ChunkGCEntry]):
+        """Delete chunks from chunk servers, one batched request per server."""
+        by_server: Dict[str, List[ChunkGCEntry]] = defaultdict(list)
+        for entry in entries:
+            for server_id in entry.servers:
+                by_server[server_id].append(entry)
+
+        batches = [
+            (server_id, server_entries[start:start + GC_DELETE_BATCH_SIZE])
+            for server_id, server_entries in by_server.items()
+            for start in range(0, len(server_entries), GC_DELETE_BATCH_SIZE)
+        ]
+
+        # Different servers are deleted from concurrently, within the limits
+        for _ in self._delete_pool.map(lambda b: self._delete_batch(*b), batches):
+            pass
+
+    def _delete_batch(self, server_id: str, batch: List[ChunkGCEntry]):
+        """Send one throttled delete batch and re-queue what failed."""
+        self._delete_bucket.acquire(len(batch))
+        try:
+            with self._delete_sem:
+                failed = self._delete_chunk_batch(
+                    server_id, [entry.chunk_id for entry in batch]
+                )
+        except Exception as e:
+            print(f"Failed to delete {len(batch)} chunks from {server_id}: {e}")
+            failed = {entry.chunk_id for entry in batch}
+
+        for entry in batch:
+            if entry.chunk_id in failed:
+                self._retry_chunk_gc(entry, server_id)
+
+    def _delete_chunk_batch(self, server_id: str, chunk_ids: List[str]) -> Set[str]:
+        """Delete a batch of chunks from one server. Returns IDs that failed."""
+        # In production, this would be one RPC to the chunk server
+        # client = self.get_chunk_server_client(server_id)
+        # return set(client.delete_chunks(chunk_ids))
+        print(f"Would delete {len(chunk_ids)} chunks from {server_id}")
+        return set()
+
+    def _retry_chunk_gc(self, entry: ChunkGCEntry, server_id: str):
+        """Re-queue a failed deletion on one server with exponential backoff."""
+        attempts = entry.attempts + 1
+        delay = min(GC_RETRY_BASE_SECONDS * 2 ** (attempts - 1), GC_RETRY_MAX_SECONDS)
+        retry = self._entry_pool.acquire(
+            entry.chunk_id,
+            [server_id],
+            datetime.now() + timedelta(seconds=delay),
+            attempts,
+        )
+        self.storage.put_gc_entries([retry])
+        self.chunk_gc_queue.put(retry)
 
     # ─────────────────────────────────────────────────────────────
     # ORPHAN DETECTION
@@ -200,34 +630,71 @@ class GarbageCollector:
         """Perform orphan chunk detection."""
         print("Starting orphan chunk scan")
 
-        # Get all known chunk IDs from metadata
-        known_chunks: Set[str] = set()
-        for chunk in self.storage.scan_all_chunks():
-            known_chunks.add(chunk.chunk_id)
+        # Get all known chunk IDs from metadata, as a compact Bloom filter
+        known_chunks = _ScalableBloomFilter(ORPHAN_BLOOM_CAPACITY, ORPHAN_BLOOM_ERROR_RATE)
+        for chunk_id in self.storage.scan_chunk_ids():
+            known_chunks.add(chunk_id)
 
-        # In production, we would iterate over all chunk servers
-        # and compare their chunks against known_chunks
-        # For now, just log the count
         print(f"Found {len(known_chunks)} known chunks in metadata")
 
-        # Check each chunk server
-        for server in self.storage.list_servers():
-            try:
-                # In production:
-                # client = self.get_chunk_server_client(server.server_id)
-                # server_chunks = client.list_chunks()
-                #
-                # for chunk_id in server_chunks:
-                #     if chunk_id not in known_chunks:
-                #         print(f"Orphan chunk found: {chunk_id} on {server.server_id}")
-                #         client.delete_chunk(chunk_id)
-                pass
-
-            except Exception as e:
-                print(f"Failed to scan server {server.server_id}: {e}")
+        # List every chunk server concurrently from one event loop
+        servers = self.storage.list_servers()
+        asyncio.run(self._scan_servers_async(
+            [server.server_id for server in servers], known_chunks
+        ))
 
         print("Orphan chunk scan completed")
 
+    async def _scan_servers_async(self, server_ids: List[str],
+                                  known_chunks: _ScalableBloomFilter):
+        """Scan servers for orphans with at most ORPHAN_SCAN_CONCURRENCY in flight."""
+        limit = asyncio.Semaphore(ORPHAN_SCAN_CONCURRENCY)
+
+        async def scan(server_id: str):
+            async with limit:
+                await self._scan_server_orphans(server_id, known_chunks)
+
+        await asyncio.gather(*(scan(server_id) for server_id in server_ids))
+
+    async def _scan_server_orphans(self, server_id: str,
+                                   known_chunks: _ScalableBloomFilter):
+        """Delete chunks on one server that metadata does not know about.
+
+        Only chunks the filter has definitely never seen are deleted.
+        """
+        try:
+            orphans = [
+                chunk_id for chunk_id in await self._list_server_chunks(server_id)
+                if chunk_id not in known_chunks
+            ]
+            if not orphans:
+                return
+
+            print(f"Found {len(orphans)} orphan chunks on {server_id}")
+            # Deletion blocks on the GC throttle, so keep it off the event loop
+            await asyncio.to_thread(self._delete_orphans, server_id, orphans)
+
+        except Exception as e:
+            print(f"Failed to scan server {server_id}: {e}")
+
+    def _delete_orphans(self, server_id: str, orphans: List[str]):
+        """Delete orphan chunks from one server in throttled batches."""
+        now = datetime.now()
+        entries = [
+            self._entry_pool.acquire(chunk_id, [server_id], now)
+            for chunk_id in orphans
+        ]
+        for start in range(0, len(entries), GC_DELETE_BATCH_SIZE):
+            self._delete_batch(server_id, entries[start:start + GC_DELETE_BATCH_SIZE])
+        self._entry_pool.release(entries)
+
+    async def _list_server_chunks(self, server_id: str) -> List[str]:
+        """List the chunk IDs stored on a chunk server."""
+        # In production, this would be an async RPC to the chunk server
+        # client = self.get_async_chunk_server_client(server_id)
+        # return await client.list_chunks()
+        return []
+
 
 class ChunkReplicator:
     """Background service for maintaining chunk replication."""
@@ -259,13 +726,18 @@ class ChunkReplicator:
 
     def _check_under_replicated(self):
         """Find and repair under-replicated chunks."""
-        for chunk in self.storage.scan_all_chunks():
+        # One registry read per scan instead of one per replica
+        online_servers = {s.server_id for s in self.storage.list_servers(status="ONLINE")}
+
+        # Decode the next records on another thread while this one checks
+        chunks = _prefetch(
+            self.storage.scan_all_chunks(),
+            REPLICATION_PREFETCH_BATCH,
+            REPLICATION_PREFETCH_BATCHES,
+        )
+        for chunk in chunks:
             # Count healthy replicas
-            healthy_count = 0
-            for server_id in chunk.servers:
-                server = self.storage.get_server(server_id)
-                if server and server.status == "ONLINE":
-                    healthy_count += 1
+            healthy_count = len(online_servers.intersection(chunk.servers))
 
             if healthy_count < self.target_replication:
                 print(f"Under-replicated chunk: {chunk.chunk_id} "
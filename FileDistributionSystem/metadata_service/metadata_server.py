@@ -1,8 +1,12 @@
 """Main metadata service handling all file system operations."""
 
+import heapq
 import threading
+from collections import OrderedDict
+from dataclasses import replace
+from operator import attrgetter
 from datetime import datetime, timedelta
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 from common.constants import (
     ROOT_INODE_ID,
@@ -21,9 +25,25 @@ from common.models import (
     UploadSession,
     Command,
     generate_uuid,
+    generate_uuids,
 )
 from .storage import MetadataStorage
 from .raft_node import RaftNode, NotLeaderError
+from .garbage_collector import GarbageCollector
+
+# Fixed locks that lock keys hash onto. Callers never hold two at once,
+# so two keys sharing a stripe only ever wait, never deadlock.
+LOCK_STRIPES = 1024
+
+# Most resolved paths remembered by the path -> inode ID cache
+PATH_CACHE_SIZE = 10000
+
+# Fraction of capacity a server's free space must move by before the cached
+# ONLINE server list used for placement is refreshed
+SERVER_CACHE_SPACE_DELTA = 0.05
+
+# How long an upload session stays valid
+UPLOAD_SESSION_TTL = timedelta(hours=24)
 
 
 class FileSystemError(Exception):
@@ -71,43 +91,27 @@ class InvalidUploadError(FileSystemError):
     pass
 
 
+def _normalize_path(path: str) -> str:
+    """Return path with one leading and no trailing slash (root stays "/")."""
+    if path.startswith("/") and not path.endswith("/"):
+        return path  # Already normal; the common case allocates nothing
+    return "/" + path.strip("/")
+
+
 class DistributedLockManager:
     """Simple distributed lock manager.
 
     In production, this would use the Raft log for distributed locks.
     """
 
-    def __init__(self):
-        self._locks = {}
-        self._lock = threading.Lock()
-
-    def lock(self, key: str):
-        """Acquire a lock on the given key."""
-        return _LockContext(self, key)
-
-    def _acquire(self, key: str):
-        with self._lock:
-            if key not in self._locks:
-                self._locks[key] = threading.Lock()
-        self._locks[key].acquire()
+    def __init__(self, stripes: int = LOCK_STRIPES):
+        # Striped rather than one lock per key: the table stays a fixed
+        # size however many keys are ever locked
+        self._locks = tuple(threading.Lock() for _ in range(stripes))
 
-    def _release(self, key: str):
-        if key in self._locks:
-            self._locks[key].release()
-
-
-class _LockContext:
-    def __init__(self, manager: DistributedLockManager, key: str):
-        self.manager = manager
-        self.key = key
-
-    def __enter__(self):
-        self.manager._acquire(self.key)
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.manager._release(self.key)
-        return False
+    def lock(self, key) -> threading.Lock:
+        """Return the lock for a hashable key; use it as a context manager."""
+        return self._locks[hash(key) % len(self._locks)]
 
 
 class MetadataService:
@@ -118,9 +122,21 @@ class MetadataService:
         self.raft = RaftNode(node_id, peers, self.storage)
         self.locks = DistributedLockManager()
 
-        # GC queue
-        self._gc_queue = []
-        self._gc_lock = threading.Lock()
+        # Path resolution cache (LRU, path -> (inode IDs along the path,
+        # storage namespace version they were last known good at))
+        self._path_cache: OrderedDict = OrderedDict()
+        self._path_cache_lock = threading.Lock()
+
+        # ONLINE servers for placement, refreshed when the epoch moves on
+        self._server_epoch = 0
+        self._server_cache: Tuple[int, List[ChunkServer]] = (-1, [])
+        self._server_cache_lock = threading.Lock()
+        self._placement_space: Dict[str, int] = {}  # Free space as last cached
+
+        # Lazy deletion runs on the collector's background threads
+        self.gc = GarbageCollector(self.storage)
+        # A long apply backlog makes subtree deletion yield to it
+        self.raft.on_pressure = self.gc.report_pressure
 
         # Initialize root directory if needed
         if self.storage.get_inode(ROOT_INODE_ID) is None:
@@ -129,13 +145,16 @@ class MetadataService:
     def start(self):
         """Start the metadata service."""
         self.raft.start()
+        self.gc.start()
 
     def stop(self):
         """Stop the metadata service."""
+        self.gc.stop()
         self.raft.stop()
 
     def _init_root_directory(self):
         """Initialize the root directory."""
+        now = datetime.now()
         root = Inode(
             inode_id=ROOT_INODE_ID,
             parent_id=ROOT_INODE_ID,
@@ -144,8 +163,8 @@ class MetadataService:
             size=0,
             status=FileStatus.ACTIVE,
             version=1,
-            created_at=datetime.now(),
-            modified_at=datetime.now(),
+            created_at=now,
+            modified_at=now,
             owner="root",
         )
         self.storage.put_inode(root)
@@ -159,30 +178,114 @@ class MetadataService:
         if path == "/":
             return self.storage.get_inode(ROOT_INODE_ID)
 
-        parts = path.strip("/").split("/")
+        key = _normalize_path(path)
+        # Read before anything is looked up: a name unlinked after this
+        # point, including by a Raft-applied command, moves the version on
+        version = self.storage.namespace_version
+        with self._path_cache_lock:
+            cached = self._path_cache.get(key)
+            if cached is not None:
+                self._path_cache.move_to_end(key)
+
+        if cached is not None:
+            chain, seen = cached
+            # Names were unlinked since this entry was checked: re-check
+            # its own components (index lookups only) before trusting it
+            if seen == version or self._chain_intact(key, chain):
+                inode = self.storage.get_inode(chain[-1])
+                if inode is not None and inode.status != FileStatus.DELETED:
+                    if seen != version:
+                        self._remember_path(key, chain, version)
+                    return inode
+            self._invalidate_paths(key)
+
+        inode, chain = self._walk_path(key)
+        # A walk that raced an unlink may have resolved through it
+        if inode is not None and self.storage.namespace_version == version:
+            self._remember_path(key, chain, version)
+        return inode
+
+    def _remember_path(self, key: str, chain: Tuple[int, ...], version: int):
+        """Cache a resolved path's inode IDs as good at a namespace version."""
+        with self._path_cache_lock:
+            self._path_cache[key] = (chain, version)
+            if len(self._path_cache) > PATH_CACHE_SIZE:
+                self._path_cache.popitem(last=False)
+
+    def _chain_intact(self, path: str, chain: Tuple[int, ...]) -> bool:
+        """Check every component of a path still names the cached inode."""
+        get_child = self.storage.get_child
+        parent_id = ROOT_INODE_ID
+        for part, inode_id in zip(path[1:].split("/"), chain):
+            if get_child(parent_id, part) != inode_id:
+                return False
+            parent_id = inode_id
+        return True
+
+    def _walk_path(self, path: str) -> Tuple[Optional[Inode], Tuple[int, ...]]:
+        """Resolve a normalized path component by component, bypassing the cache.
+
+        Returns the inode and the inode IDs met along the way.
+        """
+        # Bound once: attribute lookups per component add up on deep paths
+        get_child = self.storage.get_child
+        get_inode = self.storage.get_inode
+        deleted = FileStatus.DELETED
+        inode = None
         current_inode_id = ROOT_INODE_ID
+        chain = []
 
-        for part in parts:
-            child_id = self.storage.get_child(current_inode_id, part)
+        # Inodes come from the storage object cache, so each component
+        # costs lookups only, not a JSON parse
+        for part in path[1:].split("/"):
+            child_id = get_child(current_inode_id, part)
             if child_id is None:
-                return None
+                return None, ()
 
-            inode = self.storage.get_inode(child_id)
-            if inode is None or inode.status == FileStatus.DELETED:
-                return None
+            inode = get_inode(child_id)
+            if inode is None or inode.status == deleted:
+                return None, ()
 
+            chain.append(child_id)
             current_inode_id = child_id
 
-        return self.storage.get_inode(current_inode_id)
-
-    def _resolve_parent(self, path: str) -> Tuple[Optional[Inode], str]:
-        """Get parent inode and child name from path."""
-        parts = path.strip("/").split("/")
-        child_name = parts[-1]
-        parent_path = "/" + "/".join(parts[:-1]) if len(parts) > 1 else "/"
-
-        parent_inode = self.resolve_path(parent_path)
-        return parent_inode, child_name
+        return inode, tuple(chain)
+
+    def _invalidate_paths(self, path: str):
+        """Drop cached resolutions of a path and everything below it."""
+        prefix = path.rstrip("/") + "/"
+        with self._path_cache_lock:
+            stale = [
+                cached for cached in self._path_cache
+                if cached == path or cached.startswith(prefix)
+            ]
+            for cached in stale:
+                del self._path_cache[cached]
+
+    def _entry_lock(self, parent_id: int, name: str):
+        """Lock one name in a directory; other names there stay unlocked."""
+        return self.locks.lock((parent_id, name))
+
+    def _resolve_parent(self, path: str, lookup_child: bool = True
+                        ) -> Tuple[Optional[Inode], str, Optional[Inode]]:
+        """Get parent inode, child name and child inode (if any) from path.
+
+        The child is looked up from the resolved parent, so callers never
+        need to walk the whole path a second time. Callers that re-read it
+        under a lock can skip that with lookup_child=False.
+        """
+        parent_path, _, child_name = _normalize_path(path).rpartition("/")
+        parent_inode = self.resolve_path(parent_path or "/")
+        if parent_inode is None or not lookup_child:
+            return parent_inode, child_name, None
+
+        child_inode = None
+        child_id = self.storage.get_child(parent_inode.inode_id, child_name)
+        if child_id is not None:
+            child_inode = self.storage.get_inode(child_id)
+            if child_inode is not None and child_inode.status == FileStatus.DELETED:
+                child_inode = None
+        return parent_inode, child_name, child_inode
 
     # ─────────────────────────────────────────────────────────────
     # DIRECTORY OPERATIONS
@@ -192,19 +295,23 @@ class MetadataService:
         """Create a new directory."""
         self.raft.ensure_leader()
 
-        parent_inode, dir_name = self._resolve_parent(path)
+        parent_inode, dir_name, existing = self._resolve_parent(path)
         if parent_inode is None:
             raise ParentNotFoundError(f"Parent not found for: {path}")
         if parent_inode.type != FileType.DIRECTORY:
             raise NotADirectoryError(f"Parent is not a directory: {path}")
 
         # Check if already exists
-        existing = self.storage.get_child(parent_inode.inode_id, dir_name)
         if existing is not None:
             raise AlreadyExistsError(f"Already exists: {path}")
 
-        with self.locks.lock(f"dir:{parent_inode.inode_id}"):
+        with self._entry_lock(parent_inode.inode_id, dir_name):
+            # Re-check now that no one else can create this name
+            if self.storage.get_child(parent_inode.inode_id, dir_name) is not None:
+                raise AlreadyExistsError(f"Already exists: {path}")
+
             # Create new inode
+            now = datetime.now()
             new_inode = Inode(
                 inode_id=self.storage.next_inode_id(),
                 parent_id=parent_inode.inode_id,
@@ -213,19 +320,21 @@ class MetadataService:
                 size=0,
                 status=FileStatus.ACTIVE,
                 version=1,
-                created_at=datetime.now(),
-                modified_at=datetime.now(),
+                created_at=now,
+                modified_at=now,
                 owner=owner,
             )
 
-            # Replicate through Raft
-            self.raft.propose(Command(type="CREATE_INODE", inode=new_inode))
-            self.raft.propose(Command(
-                type="ADD_CHILD",
-                parent_id=parent_inode.inode_id,
-                name=dir_name,
-                child_id=new_inode.inode_id,
-            ))
+            # Replicate through Raft as one log entry
+            self.raft.propose_batch([
+                Command(type="CREATE_INODE", inode=new_inode),
+                Command(
+                    type="ADD_CHILD",
+                    parent_id=parent_inode.inode_id,
+                    name=dir_name,
+                    child_id=new_inode.inode_id,
+                ),
+            ])
 
         return new_inode
 
@@ -242,11 +351,13 @@ class MetadataService:
 
         children = self.storage.list_children(inode.inode_id)
 
-        result = []
-        for child_name, child_id in children:
-            child_inode = self.storage.get_inode(child_id)
-            if child_inode and child_inode.status == FileStatus.ACTIVE:
-                result.append(child_inode)
+        # One multi-get for every child instead of a lookup each
+        child_inodes = self.storage.get_inodes([child_id for _, child_id in children])
+
+        result = [
+            child_inode for child_inode in child_inodes.values()
+            if child_inode.status == FileStatus.ACTIVE
+        ]
 
         return sorted(result, key=lambda x: x.name)
 
@@ -258,39 +369,38 @@ class MetadataService:
         """Initialize a file upload session."""
         self.raft.ensure_leader()
 
-        parent_inode, file_name = self._resolve_parent(path)
+        parent_inode, file_name, _ = self._resolve_parent(path, lookup_child=False)
         if parent_inode is None:
             raise ParentNotFoundError(f"Parent not found for: {path}")
 
-        # Check if file exists (for update) or create new
-        existing_id = self.storage.get_child(parent_inode.inode_id, file_name)
-
-        with self.locks.lock(f"dir:{parent_inode.inode_id}"):
-            if existing_id:
+        # Calculate chunks before taking the lock; they do not depend on it.
+        # Nothing changes server free space during this call, so every
+        # chunk gets the same placement: select once.
+        num_chunks = max(1, (size + CHUNK_SIZE - 1) // CHUNK_SIZE)
+        placement = self._select_chunk_servers(REPLICATION_FACTOR)
+        chunks = [
+            ChunkAllocation(i, chunk_id, list(placement))
+            for i, chunk_id in enumerate(generate_uuids(num_chunks))
+        ]
+
+        with self._entry_lock(parent_inode.inode_id, file_name):
+            # Look the file up under the lock, so two uploads to one name
+            # cannot both create it or both claim the same next version
+            existing_id = self.storage.get_child(parent_inode.inode_id, file_name)
+            existing = self.storage.get_inode(existing_id) if existing_id else None
+
+            if existing is not None:
                 # Update existing file - create new version
-                existing = self.storage.get_inode(existing_id)
-                inode_id = existing_id
+                inode_id = existing.inode_id
                 version = existing.version + 1
             else:
                 # New file
                 inode_id = self.storage.next_inode_id()
                 version = 1
 
-            # Calculate chunks
-            num_chunks = max(1, (size + CHUNK_SIZE - 1) // CHUNK_SIZE)
-            chunks = []
-
-            for i in range(num_chunks):
-                servers = self._select_chunk_servers(REPLICATION_FACTOR)
-
-                chunk = ChunkAllocation(
-                    chunk_index=i,
-                    chunk_id=generate_uuid(),
-                    servers=servers,
-                )
-                chunks.append(chunk)
-
-            # Create inode in UPLOADING state
+            # Create inode in UPLOADING state; one timestamp serves the
+            # inode and its upload session
+            now = datetime.now()
             inode = Inode(
                 inode_id=inode_id,
                 parent_id=parent_inode.inode_id,
@@ -299,21 +409,23 @@ class MetadataService:
                 size=size,
                 status=FileStatus.UPLOADING,
                 version=version,
-                created_at=datetime.now(),
-                modified_at=datetime.now(),
+                created_at=now,
+                modified_at=now,
                 owner=owner,
             )
 
-            self.raft.propose(Command(type="CREATE_INODE", inode=inode))
+            commands = [Command(type="CREATE_INODE", inode=inode)]
 
-            if not existing_id:
-                self.raft.propose(Command(
+            if existing is None:
+                commands.append(Command(
                     type="ADD_CHILD",
                     parent_id=parent_inode.inode_id,
                     name=file_name,
                     child_id=inode_id,
                 ))
 
+            self.raft.propose_batch(commands)
+
             # Create upload session
             session = UploadSession(
                 upload_id=generate_uuid(),
@@ -321,44 +433,54 @@ class MetadataService:
                 version=version,
                 chunks=chunks,
                 status=UploadStatus.PENDING,
-                created_at=datetime.now(),
-                expires_at=datetime.now() + timedelta(hours=24),
+                created_at=now,
+                expires_at=now + UPLOAD_SESSION_TTL,
             )
 
             self.storage.put_upload_session(session)
 
             return session
 
+    def _online_servers(self) -> List[ChunkServer]:
+        """ONLINE chunk servers, re-read from storage only after a change."""
+        cached_epoch, servers = self._server_cache
+        if cached_epoch != self._server_epoch:
+            with self._server_cache_lock:
+                cached_epoch, servers = self._server_cache
+                epoch = self._server_epoch
+                if cached_epoch != epoch:
+                    servers = self.storage.list_servers(status=ServerStatus.ONLINE)
+                    self._server_cache = (epoch, servers)
+        return servers
+
     def _select_chunk_servers(self, count: int) -> List[str]:
         """Select chunk servers for replica placement."""
-        servers = self.storage.list_servers(status=ServerStatus.ONLINE)
+        servers = self._online_servers()
 
         if not servers:
             # Return placeholder servers for testing
             return [f"server-{i}" for i in range(count)]
 
-        # Sort by available space
-        servers.sort(key=lambda s: s.available, reverse=True)
-
-        # Select from different zones if possible
-        selected = []
-        zones_used = set()
-
+        # Prefer servers in different zones: the emptiest server of each zone
+        zone_best = {}
         for server in servers:
-            if len(selected) >= count:
-                break
-
-            # Prefer servers in different zones
-            if server.zone not in zones_used or len(selected) < count:
-                selected.append(server.server_id)
-                zones_used.add(server.zone)
-
-        # Fill remaining with any available servers
-        for server in servers:
-            if len(selected) >= count:
-                break
-            if server.server_id not in selected:
-                selected.append(server.server_id)
+            best = zone_best.get(server.zone)
+            if best is None or server.available > best.available:
+                zone_best[server.zone] = server
+
+        by_space = attrgetter('available')
+        selected = [
+            server.server_id
+            for server in heapq.nlargest(count, zone_best.values(), key=by_space)
+        ]
+
+        # Fill remaining with the emptiest servers not yet chosen
+        if len(selected) < count:
+            for server in heapq.nlargest(count, servers, key=by_space):
+                if len(selected) >= count:
+                    break
+                if server.server_id not in selected:
+                    selected.append(server.server_id)
 
         return selected
 
@@ -377,32 +499,27 @@ class MetadataService:
         # Get the inode to calculate actual chunk sizes
         inode = self.storage.get_inode(session.inode_id)
 
-        # Save chunk metadata
-        for i, allocation in enumerate(session.chunks):
-            # Calculate actual chunk size
-            if i == len(session.chunks) - 1:
-                # Last chunk may be smaller
-                chunk_size = inode.size - (i * CHUNK_SIZE)
-            else:
-                chunk_size = CHUNK_SIZE
-
-            chunk = Chunk(
-                chunk_id=allocation.chunk_id,
-                inode_id=session.inode_id,
-                version=session.version,
-                chunk_index=i,
-                size=chunk_size,
-                checksum=chunk_checksums[i],
-                servers=allocation.servers,
-            )
+        # Save chunk metadata and activate the inode in one log entry. Every
+        # chunk is full size except the last, which holds the remainder.
+        inode_id, version = session.inode_id, session.version
+        last = len(session.chunks) - 1
+        sizes = [CHUNK_SIZE] * last + [inode.size - last * CHUNK_SIZE]
 
-            self.raft.propose(Command(type="PUT_CHUNK", chunk=chunk))
+        commands = [
+            Command(type="PUT_CHUNK", chunk=Chunk(
+                allocation.chunk_id, inode_id, version, i, size, checksum,
+                allocation.servers,
+            ))
+            for i, (allocation, size, checksum) in enumerate(
+                zip(session.chunks, sizes, chunk_checksums)
+            )
+        ]
 
         # Update inode status to ACTIVE
-        inode.status = FileStatus.ACTIVE
-        inode.modified_at = datetime.now()
+        inode = replace(inode, status=FileStatus.ACTIVE, modified_at=datetime.now())
 
-        self.raft.propose(Command(type="CREATE_INODE", inode=inode))
+        commands.append(Command(type="CREATE_INODE", inode=inode))
+        self.raft.propose_batch(commands)
 
         # Clean up session
         self.storage.delete_upload_session(upload_id)
@@ -459,33 +576,32 @@ class MetadataService:
         """Delete a file or directory."""
         self.raft.ensure_leader()
 
-        parent_inode, name = self._resolve_parent(path)
+        parent_inode, name, inode = self._resolve_parent(path)
         if parent_inode is None:
             raise ParentNotFoundError(f"Parent not found for: {path}")
-
-        inode = self.resolve_path(path)
         if inode is None:
             raise NotFoundError(f"Not found: {path}")
 
-        with self.locks.lock(f"dir:{parent_inode.inode_id}"):
+        with self._entry_lock(parent_inode.inode_id, name):
             if inode.type == FileType.DIRECTORY:
                 # Check if directory is empty
-                children = self.storage.list_children(inode.inode_id)
-                if children:
+                if self.storage.has_children(inode.inode_id):
                     raise DirectoryNotEmptyError(f"Directory not empty: {path}")
 
             # Mark as deleted (lazy deletion)
-            inode.status = FileStatus.DELETED
-            inode.modified_at = datetime.now()
+            inode = replace(inode, status=FileStatus.DELETED, modified_at=datetime.now())
 
-            self.raft.propose(Command(type="CREATE_INODE", inode=inode))
+            # Remove from parent in the same log entry
+            self.raft.propose_batch([
+                Command(type="CREATE_INODE", inode=inode),
+                Command(
+                    type="REMOVE_CHILD",
+                    parent_id=parent_inode.inode_id,
+                    name=name,
+                ),
+            ])
 
-            # Remove from parent
-            self.raft.propose(Command(
-                type="REMOVE_CHILD",
-                parent_id=parent_inode.inode_id,
-                name=name,
-            ))
+            self._invalidate_paths(_normalize_path(path))
 
             # Queue for garbage collection
             if inode.type == FileType.FILE:
@@ -497,23 +613,26 @@ class MetadataService:
         """Delete directory and all contents (lazy)."""
         self.raft.ensure_leader()
 
-        parent_inode, name = self._resolve_parent(path)
-        inode = self.resolve_path(path)
-
+        parent_inode, name, inode = self._resolve_parent(path)
         if inode is None:
             raise NotFoundError(f"Not found: {path}")
 
-        with self.locks.lock(f"dir:{parent_inode.inode_id}"):
+        with self._entry_lock(parent_inode.inode_id, name):
             # Mark root as deleted
-            inode.status = FileStatus.DELETED
-            self.raft.propose(Command(type="CREATE_INODE", inode=inode))
+            inode = replace(inode, status=FileStatus.DELETED)
 
-            # Remove from parent
-            self.raft.propose(Command(
-                type="REMOVE_CHILD",
-                parent_id=parent_inode.inode_id,
-                name=name,
-            ))
+            # Remove from parent in the same log entry
+            self.raft.propose_batch([
+                Command(type="CREATE_INODE", inode=inode),
+                Command(
+                    type="REMOVE_CHILD",
+                    parent_id=parent_inode.inode_id,
+                    name=name,
+                ),
+            ])
+
+            # Descendants stay ACTIVE until GC, so drop their cached paths
+            self._invalidate_paths(_normalize_path(path))
 
             # Queue entire subtree for background GC
             self._queue_subtree_for_gc(inode.inode_id)
@@ -522,13 +641,11 @@ class MetadataService:
 
     def _queue_for_gc(self, inode_id: int):
         """Queue an inode for garbage collection."""
-        with self._gc_lock:
-            self._gc_queue.append(("file", inode_id))
+        self.gc.queue_deletion(inode_id)
 
     def _queue_subtree_for_gc(self, inode_id: int):
         """Queue a directory subtree for garbage collection."""
-        with self._gc_lock:
-            self._gc_queue.append(("subtree", inode_id))
+        self.gc.queue_subtree_deletion(inode_id)
 
     # ─────────────────────────────────────────────────────────────
     # CHUNK SERVER MANAGEMENT
@@ -536,7 +653,12 @@ class MetadataService:
 
     def handle_heartbeat(self, server_id: str, server_info: dict):
         """Handle heartbeat from chunk server."""
+        # Subtree deletion backs off once per report, so the more heartbeats
+        # arrive, the more often it yields to them
+        self.gc.report_pressure()
+
         server = self.storage.get_server(server_id)
+        was_online = server is not None and server.status == ServerStatus.ONLINE
 
         if server is None:
             # New server registration
@@ -551,12 +673,23 @@ class MetadataService:
             )
         else:
             # Update existing
-            server.used = server_info.get("used", server.used)
-            server.last_heartbeat = datetime.now()
-            server.status = ServerStatus.ONLINE
+            server = replace(
+                server,
+                used=server_info.get("used", server.used),
+                last_heartbeat=datetime.now(),
+                status=ServerStatus.ONLINE,
+            )
 
         self.storage.register_server(server)
 
+        # Invalidate cached placement data only on changes that matter
+        published = self._placement_space.get(server_id)
+        if (not was_online or published is None or
+                abs(server.available - published) > server.capacity * SERVER_CACHE_SPACE_DELTA):
+            self._placement_space[server_id] = server.available
+            with self._server_cache_lock:
+                self._server_epoch += 1
+
     def get_server(self, server_id: str) -> Optional[ChunkServer]:
         """Get chunk server info."""
         return self.storage.get_server(server_id)
@@ -3,8 +3,12 @@
 import random
 import threading
 import time
-from typing import List, Dict, Optional
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
+from operator import attrgetter
 
 from common.constants import (
     NodeRole,
@@ -20,6 +24,29 @@ from common.models import (
     AppendEntriesResponse,
 )
 
+# Most proposals one group commit packs into a single AppendEntries round
+RAFT_MAX_BATCH_ENTRIES = 512
+
+_entry_term = attrgetter("term")
+
+# Seconds between leader heartbeat rounds
+RAFT_HEARTBEAT_INTERVAL = 0.05
+
+# Election timeout tracks measured peer round-trips: the lower bound is
+# this many times the slowest peer's smoothed RTT (never below
+# ELECTION_TIMEOUT_MIN), and no drawn timeout exceeds the ceiling (seconds)
+RAFT_ELECTION_RTT_MULTIPLE = 10
+RAFT_ELECTION_TIMEOUT_CEILING = 3.0
+RAFT_RTT_EWMA_ALPHA = 0.125  # Weight of each new RTT sample
+
+# Committed entries applied in one pass that count as the apply path being
+# under load (reported through on_pressure)
+RAFT_APPLY_PRESSURE_ENTRIES = 64
+
+# Most log entries sent to a peer in one AppendEntries request, so a
+# lagging follower is caught up in bounded steps
+RAFT_MAX_ENTRIES_PER_APPEND = 1000
+
 
 class NotLeaderError(Exception):
     """Raised when operation requires leader but node is not leader."""
@@ -51,14 +78,26 @@ class RaftNode:
         # Leader state (reinitialized after election)
         self.next_index: Dict[str, int] = {}
         self.match_index: Dict[str, int] = {}
+        self._last_sent: Dict[str, float] = {}  # peer -> time of last AppendEntries
 
         # Timing
+        self._rtt_ewma: Dict[str, float] = {}  # peer -> smoothed RTT, seconds
         self.last_heartbeat = time.time()
         self.election_timeout = self._random_election_timeout()
 
         # Locks
         self._lock = threading.RLock()
         self._apply_lock = threading.Lock()
+        # Called when the apply path falls behind, so background work backs off
+        self.on_pressure: Optional[Callable[[], None]] = None
+        # One worker per peer, so a round of RPCs costs the slowest peer's
+        # round-trip rather than the sum of them
+        self._peer_pool = ThreadPoolExecutor(
+            max_workers=len(peers) or 1, thread_name_prefix=f"raft-{node_id}"
+        )
+
+        # Wakes the election timer when a leader steps down or the node stops
+        self._election_cv = threading.Condition(self._lock)
 
         # Start background threads
         self._running = True
@@ -69,85 +108,158 @@ class RaftNode:
             target=self._run_heartbeat, daemon=True
         )
 
+        # Group commit: concurrent proposals share one append and replication round
+        self._proposals: deque = deque()  # (Command, Future)
+        self._proposal_ready = threading.Event()
+        # Guards _proposals against the committer's final drain: proposals
+        # are only queued while _accepting, which the committer clears
+        # under this lock as it exits
+        self._proposals_lock = threading.Lock()
+        self._accepting = False
+        self._committer_thread = threading.Thread(
+            target=self._run_committer, daemon=True
+        )
+
     def start(self):
         """Start the Raft node."""
         # If no peers, become leader immediately (single-node cluster)
         if not self.peers:
             self._become_leader()
+            self._announce_leadership(self.current_term)
 
         self._election_thread.start()
         self._heartbeat_thread.start()
+        with self._proposals_lock:
+            self._accepting = True
+        self._committer_thread.start()
 
     def stop(self):
         """Stop the Raft node."""
-        self._running = False
+        with self._election_cv:
+            self._running = False
+            self._election_cv.notify_all()
+        self._peer_pool.shutdown(wait=False)
 
     def _random_election_timeout(self) -> float:
-        """Get random election timeout in seconds."""
-        return random.uniform(
-            ELECTION_TIMEOUT_MIN / 1000.0,
-            ELECTION_TIMEOUT_MAX / 1000.0
-        )
+        """Get random election timeout in seconds.
+
+        Drawn from [base, base * MAX/MIN], where base is
+        ELECTION_TIMEOUT_MIN until peer round-trips say it should be
+        longer. The RTTs are smoothed, so one slow reply barely moves it
+        and a recovery brings it back down gradually. Base is capped so
+        the whole range stays under RAFT_ELECTION_TIMEOUT_CEILING.
+        """
+        spread = ELECTION_TIMEOUT_MAX / ELECTION_TIMEOUT_MIN
+        base = ELECTION_TIMEOUT_MIN / 1000.0
+        if self._rtt_ewma:
+            base = min(
+                max(base, RAFT_ELECTION_RTT_MULTIPLE * max(self._rtt_ewma.values())),
+                RAFT_ELECTION_TIMEOUT_CEILING / spread,
+            )
+        return random.uniform(base, base * spread)
+
+    def _call_peer(self, send, peer: str, request):
+        """Make an RPC to a peer, folding its round-trip into the RTT average."""
+        started = time.perf_counter()
+        response = send(peer, request)
+        if response is not None:
+            rtt = time.perf_counter() - started
+            previous = self._rtt_ewma.get(peer, rtt)
+            self._rtt_ewma[peer] = previous + RAFT_RTT_EWMA_ALPHA * (rtt - previous)
+        return response
 
     # ─────────────────────────────────────────────────────────────
     # LEADER ELECTION
     # ─────────────────────────────────────────────────────────────
 
     def _run_election_timer(self):
-        """Background thread to check election timeout."""
-        while self._running:
-            time.sleep(0.01)  # Check every 10ms
+        """Background thread to check election timeout.
 
-            with self._lock:
+        Sleeps until the current deadline instead of polling. Heartbeats
+        only push last_heartbeat forward, so waking at the old deadline
+        just means waiting out the remainder.
+        """
+        while self._running:
+            with self._election_cv:
                 if self.role == NodeRole.LEADER:
+                    self._election_cv.wait()
                     continue
 
-                elapsed = time.time() - self.last_heartbeat
-                if elapsed > self.election_timeout:
-                    self._start_election()
+                remaining = self.election_timeout - (time.time() - self.last_heartbeat)
+                if remaining > 0:
+                    self._election_cv.wait(timeout=remaining)
+                    continue
+
+            # Outside the lock: the election waits on the network
+            self._start_election()
 
     def _start_election(self):
-        """Start a new election."""
+        """Start a new election.
+
+        The lock is held only to set up the candidacy and to count the
+        votes, not while waiting on peers. Votes are discarded if the term
+        moved on in the meantime.
+        """
         with self._lock:
             self.current_term += 1
             self.role = NodeRole.CANDIDATE
             self.voted_for = self.node_id
             self.election_timeout = self._random_election_timeout()
-
-            votes_received = 1  # Vote for self
+            # Restart the timer, so a lost election waits out the new timeout
+            self.last_heartbeat = time.time()
 
             # Get last log info
             last_log_index = len(self.log) - 1
             last_log_term = self.log[last_log_index].term if self.log else 0
 
-            # Request votes from all peers
-            for peer in self.peers:
-                response = self._send_request_vote(
-                    peer,
-                    VoteRequest(
-                        term=self.current_term,
-                        candidate_id=self.node_id,
-                        last_log_index=last_log_index,
-                        last_log_term=last_log_term,
-                    )
-                )
+            request = VoteRequest(
+                term=self.current_term,
+                candidate_id=self.node_id,
+                last_log_index=last_log_index,
+                last_log_term=last_log_term,
+            )
+
+        # Request votes from all peers in parallel, counting them as they
+        # arrive and stopping at a majority or a higher term
+        futures = [
+            self._peer_pool.submit(self._call_peer, self._send_request_vote, peer, request)
+            for peer in self.peers
+        ]
+        majority = (len(self.peers) + 1) // 2 + 1
+        votes_received = 1  # Vote for self
+        higher_term = None
+        for future in as_completed(futures):
+            response = future.result()
+            if response is None:
+                continue
+            if response.term > request.term:
+                higher_term = response.term
+                break
+            if response.vote_granted:
+                votes_received += 1
+                if votes_received >= majority:
+                    break
+        for future in futures:
+            future.cancel()  # Only stops RPCs that haven't been sent yet
 
-                if response and response.vote_granted:
-                    votes_received += 1
+        with self._lock:
+            if self.current_term != request.term or self.role != NodeRole.CANDIDATE:
+                return  # Stale: another election or a leader got here first
 
-                # Check if discovered higher term
-                if response and response.term > self.current_term:
-                    self.current_term = response.term
-                    self.role = NodeRole.FOLLOWER
-                    self.voted_for = None
-                    return
+            # Check if discovered higher term
+            if higher_term is not None:
+                self._step_down(higher_term)
+                return
 
             # Check if won election
-            majority = (len(self.peers) + 1) // 2 + 1
             if votes_received >= majority:
                 self._become_leader()
             else:
                 self.role = NodeRole.FOLLOWER
+                return
+
+        # Announced after the lock is released; writing stdout can block
+        self._announce_leadership(request.term)
 
     def _send_request_vote(self, peer: str, request: VoteRequest) -> Optional[VoteResponse]:
         """Send RequestVote RPC to peer.
@@ -163,9 +275,7 @@ class RaftNode:
         with self._lock:
             # Update term if needed
             if request.term > self.current_term:
-                self.current_term = request.term
-                self.role = NodeRole.FOLLOWER
-                self.voted_for = None
+                self._step_down(request.term)
 
             # Deny if term is old
             if request.term < self.current_term:
@@ -202,7 +312,17 @@ class RaftNode:
             self.next_index[peer] = len(self.log)
             self.match_index[peer] = -1
 
-        print(f"Node {self.node_id} became leader for term {self.current_term}")
+    def _announce_leadership(self, term: int):
+        """Log a won election. Call without holding self._lock."""
+        print(f"Node {self.node_id} became leader for term {term}")
+
+    def _step_down(self, term: int):
+        """Adopt a higher term as a follower. Caller must hold self._lock."""
+        if self.role == NodeRole.LEADER:
+            self._election_cv.notify_all()
+        self.current_term = term
+        self.role = NodeRole.FOLLOWER
+        self.voted_for = None
 
     # ─────────────────────────────────────────────────────────────
     # LOG REPLICATION
@@ -211,99 +331,222 @@ class RaftNode:
     def _run_heartbeat(self):
         """Background thread to send heartbeats as leader."""
         while self._running:
-            time.sleep(0.05)  # 50ms heartbeat interval
+            time.sleep(RAFT_HEARTBEAT_INTERVAL)
 
-            with self._lock:
-                if self.role != NodeRole.LEADER:
-                    continue
+            if self.role != NodeRole.LEADER or not self._running:
+                continue
 
-                self._send_heartbeats()
+            self._send_heartbeats()
 
     def _send_heartbeats(self):
-        """Send heartbeats/AppendEntries to all peers."""
-        for peer in self.peers:
-            self._replicate_to_peer(peer)
+        """Send heartbeats/AppendEntries to peers that need one.
+
+        A peer that already holds the whole log and was sent an
+        AppendEntries within the last half interval is skipped: that
+        request already reset its election timer, and the next round
+        comes well inside the election timeout.
+        """
+        now = time.time()
+        last_index = len(self.log) - 1
+        due = [
+            peer for peer in self.peers
+            if self.match_index.get(peer, -1) < last_index
+            or now - self._last_sent.get(peer, 0.0) >= RAFT_HEARTBEAT_INTERVAL / 2
+        ]
+        for _ in self._peer_pool.map(self._replicate_to_peer, due):
+            pass
 
     def propose(self, command: Command) -> bool:
         """Propose a command to be replicated.
 
         Only the leader can propose commands.
         """
-        with self._lock:
-            if self.role != NodeRole.LEADER:
-                raise NotLeaderError(self.leader_id)
+        return self.propose_async(command).result()
 
-            # Append to local log
-            entry = LogEntry(
-                term=self.current_term,
-                command=command,
-                index=len(self.log)
-            )
-            self.log.append(entry)
+    def propose_batch(self, commands: List[Command]) -> bool:
+        """Propose several commands as one log entry, applied atomically.
 
-            # Replicate to followers
-            return self._replicate_to_majority()
+        Goes through the group committer, so concurrent callers share a
+        replication round.
+        """
+        if len(commands) == 1:
+            command = commands[0]
+        else:
+            command = Command(type="BATCH", ops=commands)
+        return self.propose_async(command).result()
 
-    def _replicate_to_majority(self) -> bool:
-        """Replicate current log to majority of nodes."""
-        success_count = 1  # Self
+    def propose_async(self, command: Command) -> Future:
+        """Queue a command for the next group commit.
 
-        for peer in self.peers:
-            if self._replicate_to_peer(peer):
-                success_count += 1
+        The future resolves to the replication result, or raises
+        NotLeaderError if leadership is lost, or the node stops, first.
+        """
+        if self.role != NodeRole.LEADER:
+            raise NotLeaderError(self.leader_id)
 
-        # For single-node cluster, we already have majority
-        if not self.peers:
-            new_commit = len(self.log) - 1
-            if new_commit > self.commit_index:
-                self.commit_index = new_commit
-                self._apply_committed_entries()
-            return True
+        future = Future()
+        with self._proposals_lock:
+            if self._accepting:
+                self._proposals.append((command, future))
+                self._proposal_ready.set()
+                return future
+
+        if not self._running:
+            raise NotLeaderError(self.leader_id)
+
+        # Committer not started yet: commit synchronously
+        self._commit_group([(command, future)])
+        return future
+
+    def _run_committer(self):
+        """Background thread that commits queued proposals in groups."""
+        while self._running:
+            if not self._proposal_ready.wait(timeout=0.05):
+                continue
+            self._proposal_ready.clear()
+
+            while self._proposals:
+                group = []
+                while self._proposals and len(group) < RAFT_MAX_BATCH_ENTRIES:
+                    group.append(self._proposals.popleft())
+                self._commit_group(group)
+
+        # Stop accepting, then fail whatever arrived after shutdown began
+        with self._proposals_lock:
+            self._accepting = False
+            leftover = list(self._proposals)
+            self._proposals.clear()
+        for _, future in leftover:
+            future.set_exception(NotLeaderError(self.leader_id))
+
+    def _commit_group(self, group: List[tuple]):
+        """Append a group of proposals and replicate them in one round."""
+        try:
+            with self._lock:
+                if self.role != NodeRole.LEADER:
+                    raise NotLeaderError(self.leader_id)
+
+                term, base = self.current_term, len(self.log)
+                self.log.extend(
+                    LogEntry(term=term, command=command, index=base + i)
+                    for i, (command, _) in enumerate(group)
+                )
+                target = len(self.log) - 1
 
-        # Check if majority
+            # In production: one fsync of the log covers the whole group
+            result = self._replicate_to_majority(term, target)
+        except Exception as e:
+            if not self._running:
+                # e.g. the peer pool was shut down mid-round
+                e = NotLeaderError(self.leader_id)
+            for _, future in group:
+                future.set_exception(e)
+            return
+
+        for _, future in group:
+            future.set_result(result)
+
+    def _replicate_to_majority(self, term: int, target: int) -> bool:
+        """Replicate the log through index `target`, appended in `term`, to a majority.
+
+        Must be called without holding self._lock.
+        """
+        success_count = 1  # Self
+        success_count += sum(self._peer_pool.map(self._replicate_to_peer, self.peers))
+
+        # For single-node cluster, we already have majority
         majority = (len(self.peers) + 1) // 2 + 1
-        if success_count >= majority:
-            # Update commit index
-            new_commit = len(self.log) - 1
-            if new_commit > self.commit_index:
-                self.commit_index = new_commit
-                self._apply_committed_entries()
+        if not self.peers or success_count >= majority:
+            with self._lock:
+                if self.current_term != term or self.role != NodeRole.LEADER:
+                    return False
+                # Update commit index
+                if target > self.commit_index:
+                    self.commit_index = target
+                    self._apply_committed_entries()
             return True
 
         return False
 
     def _replicate_to_peer(self, peer: str) -> bool:
-        """Send AppendEntries to a single peer."""
-        prev_log_index = self.next_index.get(peer, 0) - 1
-        prev_log_term = 0
-        if prev_log_index >= 0 and prev_log_index < len(self.log):
-            prev_log_term = self.log[prev_log_index].term
+        """Send AppendEntries to a single peer until it holds the whole log.
 
-        entries = self.log[self.next_index.get(peer, 0):]
+        Entries go out in batches of at most RAFT_MAX_ENTRIES_PER_APPEND.
+        Returns False as soon as a request fails or is rejected, or once
+        this node is no longer leader for the term it started in.
 
-        response = self._send_append_entries(
-            peer,
-            AppendEntriesRequest(
-                term=self.current_term,
-                leader_id=self.node_id,
-                prev_log_index=prev_log_index,
-                prev_log_term=prev_log_term,
-                entries=entries,
-                leader_commit=self.commit_index,
-            )
-        )
+        Each request is built from a snapshot taken under self._lock and
+        sent without it; the response is reconciled under the lock again.
+        """
+        with self._lock:
+            term = self.current_term
+            target = len(self.log) - 1
 
-        if response is None:
-            return False
+        while True:
+            with self._lock:
+                if self.current_term != term or self.role != NodeRole.LEADER:
+                    return False
+
+                start = self.next_index.get(peer, 0)
+                prev_log_index = start - 1
+                prev_log_term = 0
+                if prev_log_index >= 0 and prev_log_index < len(self.log):
+                    prev_log_term = self.log[prev_log_index].term
+
+                entries = self.log[start:start + RAFT_MAX_ENTRIES_PER_APPEND]
+
+                request = AppendEntriesRequest(
+                    term=term,
+                    leader_id=self.node_id,
+                    prev_log_index=prev_log_index,
+                    prev_log_term=prev_log_term,
+                    entries=entries,
+                    leader_commit=self.commit_index,
+                )
 
-        if response.success:
-            self.next_index[peer] = len(self.log)
-            self.match_index[peer] = len(self.log) - 1
-            return True
-        else:
-            # Decrement next_index and retry
-            self.next_index[peer] = max(0, self.next_index.get(peer, 0) - 1)
-            return False
+            self._last_sent[peer] = time.time()
+            response = self._call_peer(self._send_append_entries, peer, request)
+
+            if response is None:
+                return False
+
+            with self._lock:
+                if response.term > self.current_term:
+                    self._step_down(response.term)
+                    return False
+                if self.current_term != term or self.role != NodeRole.LEADER:
+                    return False
+
+                if not response.success:
+                    self.next_index[peer] = self._next_index_after_conflict(peer, response)
+                    return False
+
+                # Acknowledge only what this request carried, and never move
+                # backwards, so responses landing out of order are harmless
+                matched = prev_log_index + len(entries)
+                self.match_index[peer] = max(self.match_index.get(peer, -1), matched)
+                self.next_index[peer] = max(self.next_index.get(peer, 0), matched + 1)
+                if matched >= target:
+                    return True
+
+    def _next_index_after_conflict(self, peer: str,
+                                   response: AppendEntriesResponse) -> int:
+        """Pick where to retry a peer that rejected AppendEntries.
+
+        Uses the follower's hint to skip a whole conflicting term per round
+        trip; without one, halves the distance to the last known match.
+        """
+        if response.conflict_term is not None:
+            # Resume after our last entry of that term, if we have one
+            last = bisect_right(self.log, response.conflict_term, key=_entry_term) - 1
+            if last >= 0 and self.log[last].term == response.conflict_term:
+                return last + 1
+        if response.conflict_index is not None:
+            return response.conflict_index
+
+        next_index = self.next_index.get(peer, 0)
+        gap = next_index - self.match_index.get(peer, -1)
+        return max(0, next_index - max(1, gap // 2))
 
     def _send_append_entries(self, peer: str, request: AppendEntriesRequest) -> Optional[AppendEntriesResponse]:
         """Send AppendEntries RPC to peer.
@@ -317,6 +560,10 @@ class RaftNode:
         """Handle incoming AppendEntries RPC."""
         with self._lock:
             self.last_heartbeat = time.time()
+            if self.role == NodeRole.LEADER:
+                # Stepping down (or rejecting a stale leader); either way
+                # the timer re-checks the role
+                self._election_cv.notify_all()
 
             # Update term if needed
             if request.term > self.current_term:
@@ -334,21 +581,37 @@ class RaftNode:
             # Check if log matches at prev_log_index
             if request.prev_log_index >= 0:
                 if request.prev_log_index >= len(self.log):
-                    return AppendEntriesResponse(term=self.current_term, success=False)
-                if self.log[request.prev_log_index].term != request.prev_log_term:
+                    return AppendEntriesResponse(
+                        term=self.current_term, success=False,
+                        conflict_index=len(self.log),
+                    )
+                conflict_term = self.log[request.prev_log_index].term
+                if conflict_term != request.prev_log_term:
+                    # Point the leader at the first entry of the conflicting
+                    # term (terms never decrease along the log)
+                    conflict_index = bisect_left(
+                        self.log, conflict_term, hi=request.prev_log_index,
+                        key=_entry_term,
+                    )
                     # Delete conflicting entries
-                    self.log = self.log[:request.prev_log_index]
-                    return AppendEntriesResponse(term=self.current_term, success=False)
-
-            # Append new entries
-            for i, entry in enumerate(request.entries):
-                index = request.prev_log_index + 1 + i
-                if index < len(self.log):
-                    if self.log[index].term != entry.term:
-                        self.log = self.log[:index]
-                        self.log.append(entry)
-                else:
-                    self.log.append(entry)
+                    del self.log[request.prev_log_index:]
+                    return AppendEntriesResponse(
+                        term=self.current_term, success=False,
+                        conflict_index=conflict_index, conflict_term=conflict_term,
+                    )
+
+            # Append new entries. By log matching, entries we already hold
+            # form a prefix; find where it ends, truncate once, extend once.
+            entries = request.entries
+            base = request.prev_log_index + 1
+            log = self.log
+            overlap = min(len(entries), len(log) - base)
+            k = 0
+            while k < overlap and log[base + k].term == entries[k].term:
+                k += 1
+            if k < len(entries):
+                del log[base + k:]
+                log.extend(entries[k:])
 
             # Update commit index
             if request.leader_commit > self.commit_index:
@@ -360,6 +623,9 @@ class RaftNode:
     def _apply_committed_entries(self):
         """Apply committed log entries to state machine."""
         with self._apply_lock:
+            if (self.commit_index - self.last_applied >= RAFT_APPLY_PRESSURE_ENTRIES
+                    and self.on_pressure is not None):
+                self.on_pressure()
             while self.last_applied < self.commit_index:
                 self.last_applied += 1
                 if self.last_applied < len(self.log):
@@ -368,16 +634,25 @@ class RaftNode:
 
     def _apply_command(self, command: Command):
         """Apply a command to the metadata storage."""
-        if command.type == "CREATE_INODE":
-            self.storage.put_inode(command.inode)
-        elif command.type == "DELETE_INODE":
-            self.storage.delete_inode(command.inode_id)
-        elif command.type == "ADD_CHILD":
-            self.storage.add_child(command.parent_id, command.name, command.child_id)
-        elif command.type == "REMOVE_CHILD":
-            self.storage.remove_child(command.parent_id, command.name)
-        elif command.type == "PUT_CHUNK":
-            self.storage.put_chunk(command.chunk)
+        handler = self._APPLY_HANDLERS.get(command.type)
+        if handler is not None:
+            handler(self, command)
+
+    def _apply_batch(self, command: Command):
+        """Apply a BATCH command's sub-commands as one storage write."""
+        with self.storage.batch():
+            for op in command.ops:
+                self._apply_command(op)
+
+    # Command type -> handler(node, command); one lookup per applied entry
+    _APPLY_HANDLERS = {
+        "BATCH": _apply_batch,
+        "CREATE_INODE": lambda node, c: node.storage.put_inode(c.inode),
+        "DELETE_INODE": lambda node, c: node.storage.delete_inode(c.inode_id),
+        "ADD_CHILD": lambda node, c: node.storage.add_child(c.parent_id, c.name, c.child_id),
+        "REMOVE_CHILD": lambda node, c: node.storage.remove_child(c.parent_id, c.name),
+        "PUT_CHUNK": lambda node, c: node.storage.put_chunk(c.chunk),
+    }
 
     # ─────────────────────────────────────────────────────────────
     # LINEARIZABLE READS
@@ -398,32 +673,33 @@ class RaftNode:
             if not self.peers:
                 return max(0, read_index)
 
-            # Confirm leadership with heartbeat round
-            acks = 1  # Self
-            for peer in self.peers:
-                response = self._send_append_entries(
-                    peer,
-                    AppendEntriesRequest(
-                        term=self.current_term,
-                        leader_id=self.node_id,
-                        prev_log_index=len(self.log) - 1,
-                        prev_log_term=self.log[-1].term if self.log else 0,
-                        entries=[],
-                        leader_commit=self.commit_index,
-                    )
-                )
-                if response and response.success:
-                    acks += 1
+            request = AppendEntriesRequest(
+                term=self.current_term,
+                leader_id=self.node_id,
+                prev_log_index=len(self.log) - 1,
+                prev_log_term=self.log[-1].term if self.log else 0,
+                entries=[],
+                leader_commit=self.commit_index,
+            )
 
-            majority = (len(self.peers) + 1) // 2 + 1
-            if acks < majority:
-                raise NotLeaderError(None)
+        # Confirm leadership with heartbeat round, without holding the lock
+        responses = self._peer_pool.map(
+            lambda peer: self._send_append_entries(peer, request), self.peers
+        )
+        acks = 1  # Self
+        for response in responses:
+            if response and response.success:
+                acks += 1
+
+        majority = (len(self.peers) + 1) // 2 + 1
+        if acks < majority or self.current_term != request.term:
+            raise NotLeaderError(None)
 
-            # Wait for state machine to catch up
-            while self.last_applied < read_index:
-                time.sleep(0.001)
+        # Wait for state machine to catch up
+        while self.last_applied < read_index:
+            time.sleep(0.001)
 
-            return read_index
+        return read_index
 
     def ensure_leader(self):
         """Ensure this node is the leader."""
@@ -2,10 +2,128 @@
 
 import json
 import threading
-from typing import List, Tuple, Optional, Iterator
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import fields
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter
+from typing import Dict, List, Tuple, Optional, Iterator
 from datetime import datetime
 
-from common.models import Inode, Chunk, ChunkServer, UploadSession
+from common.models import (
+    Inode, Chunk, ChunkAllocation, ChunkGCEntry, ChunkServer, UploadSession,
+)
+
+# Keys a prefix scan copies out per lock acquisition; the scan itself
+# (and whatever the caller does per key) runs unlocked
+SCAN_BATCH_SIZE = 1024
+
+# Lock stripes for chunk reference counts; updates to different chunks
+# rarely share one
+REF_LOCK_STRIPES = 64
+
+# Lock stripes serializing writes to a single key
+KEY_LOCK_STRIPES = 64
+
+# Decoded inodes, servers and upload sessions kept to skip JSON parsing
+OBJECT_CACHE_SIZE = 10000
+
+# Target keys per bucket of the sorted key index; a bucket splits at twice this
+INDEX_BUCKET_SIZE = 1000
+
+# Key families that are only ever read by exact key stay out of the sorted
+# index, so their (numerous) inserts and deletes don't pay for it
+UNSCANNED_PREFIXES = ("inode:", "chunk_ref:")
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls) -> Tuple[str, ...]:
+    """Field names of a dataclass, computed once per class."""
+    return tuple(f.name for f in fields(cls))
+
+
+@lru_cache(maxsize=None)
+def _datetime_fields(cls) -> Tuple[str, ...]:
+    """Names of a dataclass's datetime fields, computed once per class."""
+    return tuple(f.name for f in fields(cls) if 'datetime' in str(f.type))
+
+
+def _encode_default(value):
+    """Encode the values json can't: dataclasses (also nested) and datetimes."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return {name: getattr(value, name) for name in _field_names(type(value))}
+
+
+# One shared encoder instead of json.dumps building one per call
+_encode = json.JSONEncoder(default=_encode_default, separators=(',', ':')).encode
+
+
+class _SortedKeyIndex:
+    """Sorted set of keys held in bounded buckets.
+
+    Inserts and deletes move at most one bucket's worth of entries rather
+    than shifting one flat list of every key.
+    """
+
+    __slots__ = ("_buckets", "_maxes")
+
+    def __init__(self):
+        self._buckets: List[List[str]] = []
+        self._maxes: List[str] = []  # Last (largest) key of each bucket
+
+    def add(self, key: str):
+        """Insert a key that is not already present."""
+        buckets, maxes = self._buckets, self._maxes
+        if not maxes:
+            buckets.append([key])
+            maxes.append(key)
+            return
+
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            # Past every key: extend the last bucket
+            i -= 1
+            bucket = buckets[i]
+            bucket.append(key)
+            maxes[i] = key
+        else:
+            bucket = buckets[i]
+            insort(bucket, key)
+
+        if len(bucket) > 2 * INDEX_BUCKET_SIZE:
+            half = len(bucket) // 2
+            buckets.insert(i + 1, bucket[half:])
+            del bucket[half:]
+            maxes.insert(i, bucket[-1])
+
+    def remove(self, key: str):
+        """Remove a key that is present."""
+        i = bisect_left(self._maxes, key)
+        bucket = self._buckets[i]
+        del bucket[bisect_left(bucket, key)]
+        if not bucket:
+            del self._buckets[i]
+            del self._maxes[i]
+        else:
+            self._maxes[i] = bucket[-1]
+
+    def slice_from(self, start: str, inclusive: bool, limit: int) -> List[str]:
+        """Up to `limit` keys in order, from `start` (or just past it)."""
+        find = bisect_left if inclusive else bisect_right
+        buckets = self._buckets
+        i = find(self._maxes, start)
+        if i == len(buckets):
+            return []
+        bucket = buckets[i]
+        keys = bucket[find(bucket, start):][:limit]
+        i += 1
+        while len(keys) < limit and i < len(buckets):
+            keys.extend(buckets[i][:limit - len(keys)])
+            i += 1
+        return keys
 
 
 class MetadataStorage:
@@ -18,65 +136,131 @@ class MetadataStorage:
     def __init__(self, db_path: str):
         self.db_path = db_path
         self._data = {}  # In production: RocksDB instance
+        # Sorted copy of the scanned keys, so prefix scans seek instead of
+        # filtering every key (RocksDB iterates in key order natively)
+        self._keys = _SortedKeyIndex()
+        # parent_id -> {name: child_id}, loaded from the KV on first access
+        self._children_index: Dict[int, Dict[str, int]] = {}
+        # Bumped after every unlink or rebind of a name, however it was
+        # applied (locally or from the Raft log), so path caches built on
+        # top can tell when an entry they resolved may have gone
+        self.namespace_version = 0
+        # Upload sessions sorted by (expires_at, upload_id), plus each
+        # session's expiry for removal; loaded from the KV on first access
+        self._expiry_index: Optional[List[Tuple[datetime, str]]] = None
+        self._session_expiry: Dict[str, datetime] = {}
+        # Lock order: _lock, then a ref stripe, then a key stripe, then
+        # _keys_lock. _lock covers batches, multi-key reads and the indexes
+        # above; a single-key write only takes its key's stripe, plus
+        # _keys_lock if the key is added or removed.
         self._lock = threading.RLock()
+        self._key_locks = [threading.Lock() for _ in range(KEY_LOCK_STRIPES)]
+        self._keys_lock = threading.Lock()
+        self._inode_id_lock = threading.Lock()
+        # Reference counts as ints, written through to the KV
+        self._ref_counts: Dict[str, int] = {}
+        self._ref_locks = [threading.Lock() for _ in range(REF_LOCK_STRIPES)]
+        # key -> (raw value, decoded object). An entry is only trusted while
+        # the KV still holds that same raw string, so writes never need to
+        # invalidate it. Cached objects are shared: callers must not mutate
+        # them, and should dataclasses.replace() to change a field.
+        self._obj_cache: OrderedDict = OrderedDict()
+        self._obj_cache_lock = threading.Lock()
         self._next_inode_id = 2  # 1 is reserved for root
 
     def _get(self, key: str) -> Optional[str]:
         """Get value by key."""
-        with self._lock:
-            return self._data.get(key)
+        # A single dict lookup is atomic under the GIL; no lock needed
+        return self._data.get(key)
 
     def _put(self, key: str, value: str):
         """Put key-value pair."""
-        with self._lock:
+        with self._key_locks[hash(key) % KEY_LOCK_STRIPES]:
+            if key not in self._data and not key.startswith(UNSCANNED_PREFIXES):
+                with self._keys_lock:
+                    self._keys.add(key)
             self._data[key] = value
 
     def _delete(self, key: str):
         """Delete key."""
+        with self._key_locks[hash(key) % KEY_LOCK_STRIPES]:
+            if (self._data.pop(key, None) is not None
+                    and not key.startswith(UNSCANNED_PREFIXES)):
+                with self._keys_lock:
+                    self._keys.remove(key)
+
+    @contextmanager
+    def batch(self):
+        """Group several writes so multi-key reads see all of them or none.
+
+        A prefix scan reads SCAN_BATCH_SIZE keys at a time, each under the
+        lock, so every step of it sees a batch whole; a scan longer than
+        one step may see a batch that landed between two of its steps.
+        """
+        # In production: a RocksDB WriteBatch committed on exit
         with self._lock:
-            self._data.pop(key, None)
-
-    def _prefix_scan(self, prefix: str) -> Iterator[Tuple[str, str]]:
-        """Scan all keys with given prefix."""
-        with self._lock:
-            for key, value in self._data.items():
-                if key.startswith(prefix):
-                    yield key, value
+            yield
+
+    def _prefix_scan(self, prefix: str,
+                     after: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """Scan all keys with given prefix in key order.
+
+        If `after` is given, start past the key `prefix + after`. Keys in
+        UNSCANNED_PREFIXES families are not indexed and never returned.
+        """
+        lock, keys_lock, keys, data = self._lock, self._keys_lock, self._keys, self._data
+        last = None if after is None else prefix + after
+        while True:
+            # Keys and values are read together under the lock, so a write
+            # batch is never seen half-applied; callers run outside it
+            with lock:
+                with keys_lock:
+                    if last is None:
+                        batch = keys.slice_from(prefix, True, SCAN_BATCH_SIZE)
+                    else:
+                        batch = keys.slice_from(last, False, SCAN_BATCH_SIZE)
+                items = []
+                past_prefix = False
+                for key in batch:
+                    if not key.startswith(prefix):
+                        past_prefix = True
+                        break
+                    value = data.get(key)
+                    if value is not None:  # Deleted by an unbatched write
+                        items.append((key, value))
+            yield from items
+            if past_prefix or len(batch) < SCAN_BATCH_SIZE:
+                return
+            last = batch[-1]
+
+    def _cached(self, key: str, data: str, decode, *args):
+        """Decode `data` (the current value of `key`), reusing a cached object."""
+        with self._obj_cache_lock:
+            hit = self._obj_cache.get(key)
+            if hit is not None and hit[0] is data:
+                self._obj_cache.move_to_end(key)
+                return hit[1]
+
+        obj = decode(data, *args)
+        with self._obj_cache_lock:
+            self._obj_cache[key] = (data, obj)
+            self._obj_cache.move_to_end(key)
+            if len(self._obj_cache) > OBJECT_CACHE_SIZE:
+                self._obj_cache.popitem(last=False)
+        return obj
 
     def _serialize(self, obj) -> str:
         """Serialize object to JSON."""
-        if hasattr(obj, '__dataclass_fields__'):
-            data = {}
-            for field_name in obj.__dataclass_fields__:
-                value = getattr(obj, field_name)
-                if isinstance(value, datetime):
-                    value = value.isoformat()
-                elif isinstance(value, list):
-                    value = [self._serialize_value(v) for v in value]
-                data[field_name] = value
-            return json.dumps(data)
-        return json.dumps(obj)
-
-    def _serialize_value(self, value):
-        """Serialize a single value."""
-        if hasattr(value, '__dataclass_fields__'):
-            data = {}
-            for field_name in value.__dataclass_fields__:
-                v = getattr(value, field_name)
-                if isinstance(v, datetime):
-                    v = v.isoformat()
-                data[field_name] = v
-            return data
-        return value
+        return _encode(obj)
 
     def _deserialize(self, data: str, cls):
         """Deserialize JSON to object."""
         obj_dict = json.loads(data)
         # Convert datetime strings back
-        for field_name, field_type in cls.__dataclass_fields__.items():
-            if field_name in obj_dict and 'datetime' in str(field_type.type):
-                if obj_dict[field_name]:
-                    obj_dict[field_name] = datetime.fromisoformat(obj_dict[field_name])
+        for field_name in _datetime_fields(cls):
+            value = obj_dict.get(field_name)
+            if value:
+                obj_dict[field_name] = datetime.fromisoformat(value)
         return cls(**obj_dict)
 
     # ─────────────────────────────────────────────────────────────
@@ -88,9 +272,23 @@ class MetadataStorage:
         key = f"inode:{inode_id}"
         data = self._get(key)
         if data:
-            return self._deserialize(data, Inode)
+            return self._cached(key, data, self._deserialize, Inode)
         return None
 
+    def get_inodes(self, inode_ids: List[int]) -> Dict[int, Inode]:
+        """Get several inodes in one read. Missing IDs are left out."""
+        keys = [f"inode:{inode_id}" for inode_id in inode_ids]
+        with self._lock:
+            found = [
+                (inode_id, key, self._data.get(key))
+                for inode_id, key in zip(inode_ids, keys)
+            ]
+        return {
+            inode_id: self._cached(key, data, self._deserialize, Inode)
+            for inode_id, key, data in found
+            if data
+        }
+
     def put_inode(self, inode: Inode):
         """Store inode."""
         key = f"inode:{inode.inode_id}"
@@ -99,11 +297,20 @@ class MetadataStorage:
     def delete_inode(self, inode_id: int):
         """Delete inode."""
         key = f"inode:{inode_id}"
-        self._delete(key)
+        with self._lock:
+            self._delete(key)
+            self._children_index.pop(inode_id, None)
+
+    def delete_inodes(self, inode_ids: List[int]):
+        """Delete several inodes in one write."""
+        with self._lock:
+            for inode_id in inode_ids:
+                self._delete(f"inode:{inode_id}")
+                self._children_index.pop(inode_id, None)
 
     def next_inode_id(self) -> int:
         """Get next available inode ID (atomic increment)."""
-        with self._lock:
+        with self._inode_id_lock:
             inode_id = self._next_inode_id
             self._next_inode_id += 1
             return inode_id
@@ -112,31 +319,80 @@ class MetadataStorage:
     # DIRECTORY OPERATIONS
     # ─────────────────────────────────────────────────────────────
 
+    def _children(self, parent_id: int) -> Dict[str, int]:
+        """Get a directory's index entry, loading it from the KV if needed.
+
+        Caller must hold self._lock.
+        """
+        children = self._children_index.get(parent_id)
+        if children is None:
+            prefix = f"children:{parent_id}:"
+            start = len(prefix)
+            children = {
+                key[start:]: int(value)
+                for key, value in self._prefix_scan(prefix)
+            }
+            self._children_index[parent_id] = children
+        return children
+
     def add_child(self, parent_id: int, child_name: str, child_id: int):
         """Add child to directory."""
         key = f"children:{parent_id}:{child_name}"
-        self._put(key, str(child_id))
+        with self._lock:
+            self._put(key, str(child_id))
+            children = self._children(parent_id)
+            previous = children.get(child_name)
+            children[child_name] = child_id
+            if previous is not None and previous != child_id:
+                self.namespace_version += 1
 
     def remove_child(self, parent_id: int, child_name: str):
         """Remove child from directory."""
         key = f"children:{parent_id}:{child_name}"
-        self._delete(key)
+        with self._lock:
+            self._delete(key)
+            self._children(parent_id).pop(child_name, None)
+            self.namespace_version += 1
+
+    def remove_children(self, parent_id: int, child_names: List[str]):
+        """Remove several children from a directory in one write."""
+        with self._lock:
+            children = self._children(parent_id)
+            for child_name in child_names:
+                self._delete(f"children:{parent_id}:{child_name}")
+                children.pop(child_name, None)
+            self.namespace_version += 1
 
     def get_child(self, parent_id: int, child_name: str) -> Optional[int]:
         """Get child inode ID by name."""
-        key = f"children:{parent_id}:{child_name}"
-        data = self._get(key)
-        return int(data) if data else None
+        # Served from the children index: no key to build, no int to parse
+        children = self._children_index.get(parent_id)
+        if children is None:
+            with self._lock:
+                children = self._children(parent_id)
+        return children.get(child_name)
 
     def list_children(self, parent_id: int) -> List[Tuple[str, int]]:
         """List all children of a directory."""
+        with self._lock:
+            return list(self._children(parent_id).items())
+
+    def has_children(self, parent_id: int) -> bool:
+        """Check whether a directory has any entry."""
+        with self._lock:
+            return bool(self._children(parent_id))
+
+    def iter_children(self, parent_id: int, after: Optional[str] = None,
+                      limit: int = 1000) -> Iterator[Tuple[str, int]]:
+        """Iterate up to `limit` children in name order, starting after `after`.
+
+        Pass the last name returned as `after` to page through a large
+        directory without materializing all of its entries.
+        """
         prefix = f"children:{parent_id}:"
-        results = []
-        for key, value in self._prefix_scan(prefix):
-            child_name = key.split(":")[-1]
-            child_id = int(value)
-            results.append((child_name, child_id))
-        return results
+        start = len(prefix)
+        for key, value in islice(self._prefix_scan(prefix, after), limit):
+            yield key[start:], int(value)
 
     # ─────────────────────────────────────────────────────────────
     # CHUNK OPERATIONS
@@ -147,15 +403,17 @@ class MetadataStorage:
         key = f"chunk:{chunk.inode_id}:{chunk.version}:{chunk.chunk_index}"
         self._put(key, self._serialize(chunk))
 
+    def _decode_chunks(self, values: List[str]) -> List[Chunk]:
+        """Deserialize chunk records with one JSON parse for all of them."""
+        return [Chunk(**d) for d in json.loads("[" + ",".join(values) + "]")]
+
     def get_chunks(self, inode_id: int, version: int) -> List[Chunk]:
         """Get all chunks for a file version."""
         prefix = f"chunk:{inode_id}:{version}:"
-        chunks = []
-        for key, value in self._prefix_scan(prefix):
-            chunk_data = json.loads(value)
-            chunk = Chunk(**chunk_data)
-            chunks.append(chunk)
-        return sorted(chunks, key=lambda c: c.chunk_index)
+        chunks = self._decode_chunks([value for _, value in self._prefix_scan(prefix)])
+        # Keys order chunk indexes as text ("10" < "2"), so sort numerically
+        chunks.sort(key=attrgetter("chunk_index"))
+        return chunks
 
     def delete_chunks(self, inode_id: int, version: int):
         """Delete all chunks for a file version."""
@@ -164,6 +422,18 @@ class MetadataStorage:
         for key in keys_to_delete:
             self._delete(key)
 
+    def get_inode_chunks(self, inode_id: int) -> List[Chunk]:
+        """Get the chunks of every version of a file in one scan."""
+        prefix = f"chunk:{inode_id}:"
+        return self._decode_chunks([value for _, value in self._prefix_scan(prefix)])
+
+    def delete_inode_chunks(self, inode_id: int):
+        """Delete the chunks of every version of a file in one write."""
+        prefix = f"chunk:{inode_id}:"
+        with self._lock:
+            for key in [key for key, _ in self._prefix_scan(prefix)]:
+                self._delete(key)
+
     def scan_all_chunks(self) -> Iterator[Chunk]:
         """Scan all chunk records."""
         prefix = "chunk:"
@@ -171,34 +441,87 @@ class MetadataStorage:
             chunk_data = json.loads(value)
             yield Chunk(**chunk_data)
 
+    def scan_chunk_ids(self) -> Iterator[str]:
+        """Scan the IDs of all chunk records without building Chunk objects."""
+        loads = json.loads
+        for _, value in self._prefix_scan("chunk:"):
+            yield loads(value)["chunk_id"]
+
     # ─────────────────────────────────────────────────────────────
     # CHUNK REFERENCE COUNTING
     # ─────────────────────────────────────────────────────────────
 
+    def _add_chunk_ref(self, chunk_id: str, delta: int) -> int:
+        """Apply `delta` to a chunk's reference count, floored at zero."""
+        with self._ref_locks[hash(chunk_id) % REF_LOCK_STRIPES]:
+            count = self._ref_counts.get(chunk_id)
+            if count is None:
+                count = int(self._get(f"chunk_ref:{chunk_id}") or 0)
+            count = max(0, count + delta)
+            self._ref_counts[chunk_id] = count
+            self._put(f"chunk_ref:{chunk_id}", str(count))
+            return count
+
     def increment_chunk_ref(self, chunk_id: str) -> int:
         """Increment reference count for a chunk."""
-        key = f"chunk_ref:{chunk_id}"
-        with self._lock:
-            current = int(self._get(key) or 0)
-            new_count = current + 1
-            self._put(key, str(new_count))
-            return new_count
+        return self._add_chunk_ref(chunk_id, 1)
 
     def decrement_chunk_ref(self, chunk_id: str) -> int:
         """Decrement reference count for a chunk."""
-        key = f"chunk_ref:{chunk_id}"
-        with self._lock:
-            current = int(self._get(key) or 0)
-            new_count = max(0, current - 1)
-            self._put(key, str(new_count))
-            return new_count
+        return self._add_chunk_ref(chunk_id, -1)
+
+    def decrement_chunk_refs(self, chunk_ids: List[str]) -> List[int]:
+        """Decrement several reference counts."""
+        return [self._add_chunk_ref(chunk_id, -1) for chunk_id in chunk_ids]
 
     def get_chunk_ref(self, chunk_id: str) -> int:
         """Get reference count for a chunk."""
-        key = f"chunk_ref:{chunk_id}"
-        data = self._get(key)
+        count = self._ref_counts.get(chunk_id)
+        if count is not None:
+            return count
+        data = self._get(f"chunk_ref:{chunk_id}")
         return int(data) if data else 0
 
+    # ─────────────────────────────────────────────────────────────
+    # GARBAGE COLLECTION QUEUES
+    # ─────────────────────────────────────────────────────────────
+
+    def add_pending_deletions(self, inode_ids: List[int]):
+        """Record inodes queued for lazy deletion."""
+        with self._lock:
+            for inode_id in inode_ids:
+                self._put(f"gc_inode:{inode_id}", "")
+
+    def remove_pending_deletion(self, inode_id: int):
+        """Forget an inode once its deletion has finished."""
+        self._delete(f"gc_inode:{inode_id}")
+
+    def list_pending_deletions(self) -> List[int]:
+        """List inodes whose deletion has not finished."""
+        prefix = "gc_inode:"
+        return [int(key[len(prefix):]) for key, _ in self._prefix_scan(prefix)]
+
+    def _gc_entry_key(self, entry: ChunkGCEntry) -> str:
+        # Retries differ in attempts, so they never overwrite their predecessor
+        return f"gc_chunk:{entry.chunk_id}:{entry.attempts}:{','.join(entry.servers)}"
+
+    def put_gc_entries(self, entries: List[ChunkGCEntry]):
+        """Record chunk GC entries in one write."""
+        with self._lock:
+            for entry in entries:
+                self._put(self._gc_entry_key(entry), self._serialize(entry))
+
+    def delete_gc_entries(self, entries: List[ChunkGCEntry]):
+        """Forget chunk GC entries that have been processed."""
+        with self._lock:
+            for entry in entries:
+                self._delete(self._gc_entry_key(entry))
+
+    def scan_gc_entries(self) -> Iterator[ChunkGCEntry]:
+        """Scan all recorded chunk GC entries."""
+        for _, value in self._prefix_scan("gc_chunk:"):
+            yield self._deserialize(value, ChunkGCEntry)
+
     # ─────────────────────────────────────────────────────────────
     # CHUNK SERVER REGISTRY
     # ─────────────────────────────────────────────────────────────
@@ -213,7 +536,7 @@ class MetadataStorage:
         key = f"server:{server_id}"
         data = self._get(key)
         if data:
-            return self._deserialize(data, ChunkServer)
+            return self._cached(key, data, self._deserialize, ChunkServer)
         return None
 
     def list_servers(self, status: str = None) -> List[ChunkServer]:
@@ -221,7 +544,7 @@ class MetadataStorage:
         prefix = "server:"
         servers = []
         for key, value in self._prefix_scan(prefix):
-            server = self._deserialize(value, ChunkServer)
+            server = self._cached(key, value, self._deserialize, ChunkServer)
             if status is None or server.status == status:
                 servers.append(server)
         return servers
@@ -230,41 +553,82 @@ class MetadataStorage:
     # UPLOAD SESSION MANAGEMENT
     # ─────────────────────────────────────────────────────────────
 
+    def _expiries(self) -> List[Tuple[datetime, str]]:
+        """Get the expiry index, loading it from the KV if needed.
+
+        Caller must hold self._lock.
+        """
+        if self._expiry_index is None:
+            self._session_expiry = {
+                session.upload_id: session.expires_at
+                for session in (
+                    self._decode_upload_session(value)
+                    for _, value in self._prefix_scan("upload:")
+                )
+            }
+            self._expiry_index = sorted(
+                (expires_at, upload_id)
+                for upload_id, expires_at in self._session_expiry.items()
+            )
+        return self._expiry_index
+
+    def _unindex_session(self, upload_id: str):
+        """Drop a session from the expiry index. Caller must hold self._lock."""
+        index = self._expiries()
+        expires_at = self._session_expiry.pop(upload_id, None)
+        if expires_at is not None:
+            del index[bisect_left(index, (expires_at, upload_id))]
+
     def put_upload_session(self, session: UploadSession):
         """Store upload session."""
         key = f"upload:{session.upload_id}"
-        self._put(key, self._serialize(session))
+        with self._lock:
+            self._put(key, self._serialize(session))
+            self._unindex_session(session.upload_id)
+            insort(self._expiry_index, (session.expires_at, session.upload_id))
+            self._session_expiry[session.upload_id] = session.expires_at
 
     def get_upload_session(self, upload_id: str) -> Optional[UploadSession]:
         """Get upload session by ID."""
         key = f"upload:{upload_id}"
         data = self._get(key)
         if data:
-            obj_dict = json.loads(data)
-            # Reconstruct ChunkAllocation objects
-            from common.models import ChunkAllocation
-            obj_dict['chunks'] = [
-                ChunkAllocation(**c) if isinstance(c, dict) else c
-                for c in obj_dict.get('chunks', [])
-            ]
-            # Convert datetime strings
-            for field in ['created_at', 'expires_at']:
-                if obj_dict.get(field):
-                    obj_dict[field] = datetime.fromisoformat(obj_dict[field])
-            return UploadSession(**obj_dict)
+            return self._cached(key, data, self._decode_upload_session)
         return None
 
+    def _decode_upload_session(self, data: str) -> UploadSession:
+        """Deserialize an upload session, including its chunk allocations."""
+        obj_dict = json.loads(data)
+        # Reconstruct ChunkAllocation objects
+        obj_dict['chunks'] = [
+            ChunkAllocation(**c) if isinstance(c, dict) else c
+            for c in obj_dict.get('chunks', [])
+        ]
+        # Convert datetime strings
+        for field in ['created_at', 'expires_at']:
+            if obj_dict.get(field):
+                obj_dict[field] = datetime.fromisoformat(obj_dict[field])
+        return UploadSession(**obj_dict)
+
     def delete_upload_session(self, upload_id: str):
         """Delete upload session."""
         key = f"upload:{upload_id}"
-        self._delete(key)
+        with self._lock:
+            self._delete(key)
+            self._unindex_session(upload_id)
 
     def list_expired_uploads(self, current_time: datetime) -> List[UploadSession]:
         """List all expired upload sessions."""
-        prefix = "upload:"
+        with self._lock:
+            index = self._expiries()
+            # (current_time,) sorts before every entry expiring at current_time
+            expired_ids = [
+                upload_id
+                for _, upload_id in index[:bisect_left(index, (current_time,))]
+            ]
         expired = []
-        for key, value in self._prefix_scan(prefix):
-            session = self.get_upload_session(key.split(":")[-1])
-            if session and session.expires_at < current_time:
+        for upload_id in expired_ids:
+            session = self.get_upload_session(upload_id)
+            if session:
                 expired.append(session)
         return expired